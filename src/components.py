@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Индекс компонент связности для быстрого отказа в недостижимых запросах.
+Индекс строится один раз для лабиринта или графа городов с помощью системы
+непересекающихся множеств (union-find), так же как count_islands_bfs
+размечает острова: обходятся все клетки (вершины), и каждая объединяется
+с соседями, которые возвращает problem.actions. Если initial и goal лежат
+в разных компонентах, пути между ними нет, и поиск можно не запускать.
+Добавление клеток и рёбер обновляет индекс инкрементно, а удаление
+помечает его устаревшим — он будет перестроен при следующем запросе.
+"""
+
+import time
+
+from example_bfs import CITIES_GRAPH, MapProblem, breadth_first_search, failure
+from islands import IslandsProblem, count_islands_bfs
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+
+
+class UnionFind:
+    """Система непересекающихся множеств со сжатием путей и объединением по размеру."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.count = 0  # Число множеств
+
+    def __contains__(self, x):
+        return x in self.parent
+
+    def add(self, x):
+        if x not in self.parent:
+            self.parent[x] = x
+            self.size[x] = 1
+            self.count += 1
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        """Объединить множества a и b; возвращает False, если они уже совпадали."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        self.count -= 1
+        return True
+
+
+class ComponentIndex:
+    """
+    Индекс компонент связности.
+
+    :param states: Функция без аргументов, возвращающая все состояния (клетки, вершины).
+    :param neighbors: Функция, возвращающая соседей состояния (обычно problem.actions).
+
+    Для ориентированных графов рёбра считаются неориентированными (слабая связность):
+    разные компоненты по-прежнему гарантируют отсутствие пути.
+    """
+
+    def __init__(self, states, neighbors):
+        self._states = states
+        self._neighbors = neighbors
+        self._dirty = False
+        self.rebuild()
+
+    @classmethod
+    def for_labyrinth(cls, problem):
+        """Индекс проходимых клеток LabyrinthProblem (4 направления)."""
+
+        def states():
+            for r in range(problem.rows):
+                for c in range(problem.cols):
+                    if problem.labyrinth[r][c] == 1:
+                        yield (r, c)
+
+        return cls(states, problem.actions)
+
+    @classmethod
+    def for_map(cls, problem):
+        """Индекс городов графа MapProblem."""
+        return cls(lambda: list(problem.graph), problem.actions)
+
+    @classmethod
+    def for_islands(cls, grid):
+        """Индекс клеток суши (8 направлений); count совпадает с count_islands_bfs."""
+        problem = IslandsProblem(grid)
+
+        def states():
+            for r in range(problem.rows):
+                for c in range(problem.cols):
+                    if grid[r][c] == 1:
+                        yield (r, c)
+
+        return cls(states, problem.actions)
+
+    def rebuild(self):
+        """Построить индекс заново по текущему состоянию лабиринта или графа."""
+        uf = UnionFind()
+        for s in self._states():
+            uf.add(s)
+            for n in self._neighbors(s):
+                uf.add(n)
+                uf.union(s, n)
+        self._uf = uf
+        self._dirty = False
+
+    @property
+    def count(self):
+        """Число компонент связности."""
+        if self._dirty:
+            self.rebuild()
+        return self._uf.count
+
+    def connected(self, a, b):
+        """
+        False, если a и b точно лежат в разных компонентах.
+        Для состояний, которых нет в индексе, возвращает True (решение — за поиском).
+        """
+
+        if self._dirty:
+            self.rebuild()
+        uf = self._uf
+        if a not in uf or b not in uf:
+            return True
+        return uf.find(a) == uf.find(b)
+
+    def state_added(self, s):
+        """Состояние s стало доступным (например, стена стала проходом)."""
+        if self._dirty:
+            return
+        self._uf.add(s)
+        for n in self._neighbors(s):
+            self._uf.add(n)
+            self._uf.union(s, n)
+
+    def edge_added(self, a, b):
+        """В графе появилось ребро a -> b."""
+        if self._dirty:
+            return
+        self._uf.add(a)
+        self._uf.add(b)
+        self._uf.union(a, b)
+
+    def state_removed(self, s):
+        """Состояние s стало недоступным: индекс будет перестроен при следующем запросе."""
+        self._dirty = True
+
+    def edge_removed(self, a, b):
+        """Ребро a -> b удалено: индекс будет перестроен при следующем запросе."""
+        self._dirty = True
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    # Модель склада нужна только для демонстрации
+    from jump_point_search import warehouse_floor
+
+    grid = [
+        [1, 0, 0, 1, 1, 0, 0],
+        [1, 1, 0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 1],
+        [0, 0, 1, 0, 0, 1, 0],
+        [1, 1, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 1, 0],
+        [0, 0, 0, 0, 1, 0, 1],
+    ]
+    print("Островов (union-find): ", ComponentIndex.for_islands(grid).count, "| BFS: ", count_islands_bfs(grid))
+
+    # Склад, разделённый сплошной стеной: цель недостижима
+    floor = warehouse_floor(200, 200)
+    for r in range(200):
+        floor[r][100] = 0
+    problem = LabyrinthProblem(floor, (0, 0), (199, 199))
+
+    started = time.perf_counter()
+    index = ComponentIndex.for_labyrinth(problem)
+    time_build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    distance = bfs_labyrinth(problem)
+    time_bfs = time.perf_counter() - started
+
+    started = time.perf_counter()
+    distance_indexed = bfs_labyrinth(problem, components=index)
+    time_indexed = time.perf_counter() - started
+
+    print("Компонент в лабиринте: ", index.count, f"(построение индекса: {time_build * 1000:.2f} мс)")
+    print(
+        f"Без индекса: {distance}, {time_bfs * 1000:.2f} мс; "
+        f"с индексом: {distance_indexed}, {time_indexed * 1e6:.1f} мкс"
+    )
+
+    # В стене открывается проход — индекс обновляется инкрементно
+    floor[0][100] = 1
+    index.state_added((0, 100))
+    print("После открытия прохода: ", bfs_labyrinth(problem, components=index))
+
+    # Город, отрезанный от остальной сети дорог
+    graph = dict(CITIES_GRAPH, Лорд_Хау={"Порт_Лорд_Хау": 5}, Порт_Лорд_Хау={"Лорд_Хау": 5})
+    problem = MapProblem(initial="Буриндал", goal="Лорд_Хау", graph=graph)
+    index = ComponentIndex.for_map(problem)
+    solution_node = breadth_first_search(problem, components=index)
+    print("Маршрут до изолированного города:", "не найден" if solution_node is failure else "найден")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Иерархии сжатия (Contraction Hierarchies) для графов дорог MapProblem.
+Предварительная обработка упорядочивает вершины по важности и по очереди
+«сжимает» их, добавляя рёбра-сокращения (shortcuts) там, где без сжатой
+вершины кратчайший путь между её соседями удлинился бы. Готовую иерархию
+можно сохранить на диск (в формате JSON) и загрузить обратно.
+Запрос выполняется двунаправленным поиском только по рёбрам «вверх»
+(к более важным вершинам), после чего сокращения разворачиваются обратно
+в исходный маршрут от города к городу — тот же, что дает path_states.
+"""
+
+import heapq
+import json
+import math
+import os
+import tempfile
+import time
+
+from example_bfs import (
+    CITIES_GRAPH,
+    MapProblem,
+    Node,
+    breadth_first_search,
+    failure,
+    path_states,
+)
+
+
+class ContractionHierarchy:
+    """
+    Иерархия сжатия для ориентированного графа вида {u: {v: вес}}.
+
+    :param rank: Порядковый номер сжатия каждой вершины.
+    :param up_out: Рёбра u -> v к более важным вершинам (для прямого поиска).
+    :param up_in: Обратные рёбра v <- u от более важных вершин (для обратного поиска).
+    :param middle: Для каждого сокращения (u, w) — сжатая вершина v между ними.
+    """
+
+    def __init__(self, rank, up_out, up_in, middle):
+        self.rank = rank
+        self.up_out = up_out
+        self.up_in = up_in
+        self.middle = middle
+
+    @classmethod
+    def build(cls, graph, hop_limit=8):
+        """
+        Построить иерархию для графа.
+
+        :param graph: Граф городов (словарь словарей весов рёбер).
+        :param hop_limit: Ограничение длины поиска свидетелей (в рёбрах).
+        """
+
+        out_edges = {u: {} for u in graph}
+        in_edges = {u: {} for u in graph}
+        for u, neighbors in graph.items():
+            for v, w in neighbors.items():
+                out_edges.setdefault(v, {})
+                in_edges.setdefault(v, {})
+                if u != v and w < out_edges[u].get(v, math.inf):
+                    out_edges[u][v] = w
+                    in_edges[v][u] = w
+
+        contracted_neighbors = dict.fromkeys(out_edges, 0)
+
+        def shortcuts_for(v):
+            """Сокращения, необходимые при сжатии v: список (u, w, стоимость)."""
+            shortcuts = []
+            targets = out_edges[v]
+            if not targets:
+                return shortcuts
+            max_out = max(targets.values())
+            for u, w_uv in in_edges[v].items():
+                limit = w_uv + max_out
+                dist = _witness_search(out_edges, u, v, limit, hop_limit)
+                for w, w_vw in targets.items():
+                    if w == u:
+                        continue
+                    if dist.get(w, math.inf) > w_uv + w_vw:
+                        shortcuts.append((u, w, w_uv + w_vw))
+            return shortcuts
+
+        def importance(v):
+            # Разность рёбер плюс число уже сжатых соседей (для равномерности)
+            removed = len(out_edges[v]) + len(in_edges[v])
+            return len(shortcuts_for(v)) - removed + contracted_neighbors[v]
+
+        queue = [(importance(v), i, v) for i, v in enumerate(out_edges)]
+        heapq.heapify(queue)
+
+        rank, up_out, up_in, middle = {}, {}, {}, {}
+        while queue:
+            _, i, v = heapq.heappop(queue)
+            # Ленивое обновление: пересчитываем важность и при необходимости откладываем вершину
+            current = importance(v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, i, v))
+                continue
+
+            rank[v] = len(rank)
+            for u, w, cost in shortcuts_for(v):
+                if cost < out_edges[u].get(w, math.inf):
+                    out_edges[u][w] = cost
+                    in_edges[w][u] = cost
+                    middle[(u, w)] = v
+
+            # Все оставшиеся рёбра v ведут к вершинам, которые будут сжаты позже
+            up_out[v] = dict(out_edges[v])
+            up_in[v] = dict(in_edges[v])
+            for w in out_edges[v]:
+                del in_edges[w][v]
+                contracted_neighbors[w] += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                contracted_neighbors[u] += 1
+            del out_edges[v], in_edges[v]
+
+        return cls(rank, up_out, up_in, middle)
+
+    def save(self, path):
+        """
+        Сохранить иерархию в файл JSON. Словари с вершинами-ключами
+        записываются списками, поэтому вершины могут быть не только строками:
+        rank — пары [v, номер], рёбра — тройки [u, v, вес], middle — тройки [u, w, v].
+        """
+
+        data = {
+            "rank": [[v, r] for v, r in self.rank.items()],
+            "up_out": [[u, v, w] for u, edges in self.up_out.items() for v, w in edges.items()],
+            "up_in": [[v, u, w] for v, edges in self.up_in.items() for u, w in edges.items()],
+            "middle": [[u, w, v] for (u, w), v in self.middle.items()],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """Загрузить иерархию, сохранённую методом save."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        rank = {_vertex(v): r for v, r in data["rank"]}
+        up_out = {v: {} for v in rank}
+        up_in = {v: {} for v in rank}
+        for u, v, w in data["up_out"]:
+            up_out[_vertex(u)][_vertex(v)] = w
+        for v, u, w in data["up_in"]:
+            up_in[_vertex(v)][_vertex(u)] = w
+        middle = {(_vertex(u), _vertex(w)): _vertex(v) for u, w, v in data["middle"]}
+        return cls(rank, up_out, up_in, middle)
+
+    def _unpack(self, u, w):
+        """Развернуть ребро (возможно, сокращение) u -> w в список вершин после u."""
+        stack = [(u, w)]
+        route = []
+        while stack:
+            a, b = stack.pop()
+            v = self.middle.get((a, b))
+            if v is None:
+                route.append(b)
+            else:
+                stack.append((v, b))
+                stack.append((a, v))
+        return route
+
+    def query(self, initial, goal):
+        """
+        Кратчайший путь из initial в goal.
+        Возвращает пару (стоимость, список городов) или (math.inf, None).
+        """
+
+        if initial not in self.rank or goal not in self.rank:
+            return math.inf, None
+        if initial == goal:
+            return 0, [initial]
+
+        dist = ({initial: 0}, {goal: 0})
+        parent = ({initial: None}, {goal: None})
+        settled = (set(), set())
+        frontiers = ([(0, initial)], [(0, goal)])
+        edges = (self.up_out, self.up_in)
+        best, meeting = math.inf, None
+
+        while frontiers[0] or frontiers[1]:
+            for side in (0, 1):
+                frontier = frontiers[side]
+                if not frontier:
+                    continue
+                d, u = heapq.heappop(frontier)
+                # Остановка направления: дальше путь короче best не найти
+                if d >= best:
+                    frontier.clear()
+                    continue
+                if u in settled[side]:
+                    continue
+                settled[side].add(u)
+
+                other = dist[1 - side].get(u)
+                if other is not None and d + other < best:
+                    best, meeting = d + other, u
+
+                for v, w in edges[side][u].items():
+                    nd = d + w
+                    if nd < dist[side].get(v, math.inf):
+                        dist[side][v] = nd
+                        parent[side][v] = u
+                        heapq.heappush(frontier, (nd, v))
+
+        if meeting is None:
+            return math.inf, None
+
+        # Цепочка вершин иерархии: initial ... meeting ... goal
+        forward = []
+        u = meeting
+        while u is not None:
+            forward.append(u)
+            u = parent[0][u]
+        forward.reverse()
+        u = parent[1][meeting]
+        while u is not None:
+            forward.append(u)
+            u = parent[1][u]
+
+        route = [initial]
+        for a, b in zip(forward, forward[1:]):
+            route.extend(self._unpack(a, b))
+        return best, route
+
+
+def ch_search(hierarchy, problem):
+    """
+    Поиск маршрута для MapProblem по иерархии сжатия.
+    Возвращает узел с целевым состоянием или failure, как breadth_first_search,
+    поэтому маршрут восстанавливается обычной функцией path_states.
+    """
+
+    cost, route = hierarchy.query(problem.initial, problem.goal)
+    if route is None:
+        return failure
+
+    node = Node(route[0], path_cost=0)
+    for s1 in route[1:]:
+        s = node.state
+        node = Node(s1, parent=node, action=s1, path_cost=node.path_cost + problem.action_cost(s, s1, s1))
+    return node
+
+
+def _witness_search(out_edges, source, excluded, limit, hop_limit):
+    """
+    Ограниченный поиск Дейкстры из source, не проходящий через excluded.
+    Возвращает найденные расстояния (не больше limit).
+    """
+
+    dist = {source: 0}
+    frontier = [(0, 0, source)]
+    while frontier:
+        d, hops, u = heapq.heappop(frontier)
+        if d > dist.get(u, math.inf) or d > limit or hops >= hop_limit:
+            continue
+        for v, w in out_edges[u].items():
+            nd = d + w
+            if v != excluded and nd <= limit and nd < dist.get(v, math.inf):
+                dist[v] = nd
+                heapq.heappush(frontier, (nd, hops + 1, v))
+    return dist
+
+
+def _vertex(value):
+    """Вершина, прочитанная из JSON: списки (бывшие кортежи) снова становятся кортежами."""
+    if isinstance(value, list):
+        return tuple(_vertex(item) for item in value)
+    return value
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    started = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(CITIES_GRAPH)
+    print(f"Предварительная обработка: {time.perf_counter() - started:.4f} с, сокращений: {len(hierarchy.middle)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cities.ch.json")
+        hierarchy.save(path)
+        hierarchy = ContractionHierarchy.load(path)
+
+    # Найдем кратчайший путь из города Буриндал в город Сидней:
+    problem = MapProblem(initial="Буриндал", goal="Сидней", graph=CITIES_GRAPH)
+
+    started = time.perf_counter()
+    solution_node = ch_search(hierarchy, problem)
+    time_ch = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reference = breadth_first_search(problem)
+    time_bfs = time.perf_counter() - started
+
+    if solution_node is failure:
+        print("Путь не найден!")
+    else:
+        route = path_states(solution_node)
+        print("Маршрут:", " -> ".join(route))
+        print("Суммарная стоимость:", solution_node.path_cost)
+        print("Совпадает с breadth_first_search:", solution_node.path_cost == reference.path_cost)
+        print(f"Время запроса: {time_ch * 1e6:.1f} мкс (breadth_first_search: {time_bfs * 1e6:.1f} мкс)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ import math
 from abc import ABC, abstractmethod
 from collections import deque
 
+from search_budget import BudgetExceeded
+
 
 class Problem(ABC):
     """
@@ -159,18 +161,32 @@ class MapProblem(Problem):
         return self.graph[s][s1]
 
 
-def breadth_first_search(problem):
+def breadth_first_search(problem, components=None, budget=None):
     """
     Поиск в ширину с учётом весов рёбер.
     Возвращает узел с целевым состоянием или failure, если решения нет.
     Порядок выбора узла из frontier определяется его path_cost (минимальная сумма весов).
+    Если передан индекс компонент связности (components.ComponentIndex),
+    то при initial и goal в разных компонентах failure возвращается сразу.
+    Если передан бюджет (search_budget.SearchBudget) и он исчерпан, возвращается
+    BudgetExceeded: best — город с наименьшей эвристикой, а из равных — самый
+    дальний город, до которого уже найден кратчайший путь; bound — path_cost
+    последнего извлечённого узла (нижняя граница стоимости решения).
     """
 
+    # Цель в другой компоненте связности — искать бесполезно
+    if components is not None and not components.connected(problem.initial, problem.goal):
+        return failure
+
     # Создаём начальный узел
     start_node = Node(problem.initial, path_cost=0)
     # Помещаем его в приоритетную очередь (ключ = path_cost)
     frontier = PriorityQueue(key=lambda node: node.path_cost)
     frontier.add(start_node)
+    if budget is not None:
+        best, best_key = start_node, (problem.h(start_node), 0)
+        # Города, уже извлечённые из frontier
+        settled = set()
 
     # Пока есть узлы для расширения
     while len(frontier) > 0:
@@ -181,6 +197,19 @@ def breadth_first_search(problem):
         if problem.is_goal(node.state):
             return node
 
+        # Проверяем бюджет и запоминаем узел, ближайший к цели
+        if budget is not None:
+            reason = budget.spend()
+            if reason is not None:
+                return BudgetExceeded(reason, budget, best=best, bound=node.path_cost)
+            # Повторные извлечения города (по более длинным путям или по циклам)
+            # прогрессом не считаются: первым извлекается кратчайший путь
+            if node.state not in settled:
+                settled.add(node.state)
+                node_key = (problem.h(node), -node.path_cost)
+                if node_key < best_key:
+                    best, best_key = node, node_key
+
         # Расширяем узел и добавляем дочерние узлы в очередь
         for child in expand(problem, node):
             frontier.add(child)
@@ -189,71 +218,185 @@ def breadth_first_search(problem):
     return failure
 
 
+def single_source_search(problem, goals=None):
+    """
+    Поиск кратчайших путей из problem.initial сразу во множество городов.
+    Возвращает словарь {состояние: узел} для всех достигнутых целей из goals
+    (или для всех достижимых состояний, если goals не задано).
+    Поиск останавливается, как только все цели извлечены из frontier.
+    """
+
+    start_node = Node(problem.initial, path_cost=0)
+    frontier = PriorityQueue(key=lambda node: node.path_cost)
+    frontier.add(start_node)
+    # Лучший известный узел для каждого достигнутого состояния
+    reached = {problem.initial: start_node}
+    settled = {}
+    remaining = None if goals is None else set(goals)
+
+    while len(frontier) > 0 and (remaining is None or remaining):
+        node = frontier.pop()
+        if node.state in settled:
+            continue
+        settled[node.state] = node
+        if remaining is not None:
+            remaining.discard(node.state)
+
+        for child in expand(problem, node):
+            s = child.state
+            if s not in settled and (s not in reached or child.path_cost < reached[s].path_cost):
+                reached[s] = child
+                frontier.add(child)
+
+    if goals is None:
+        return settled
+    return {goal: settled[goal] for goal in goals if goal in settled}
+
+
+def anytime_weighted_astar(problem, weight=2.0, budget=None):
+    """
+    Anytime weighted A*: поиск с приоритетом f = g + weight * h (h — problem.h).
+    Генератор: быстро выдаёт первое решение, а затем каждое найденное
+    более дешёвое. Узлы, которые не могут улучшить текущее решение
+    (g + h >= его стоимости), отсекаются. Поиск заканчивается, когда frontier
+    пуст (последнее выданное решение оптимально при допустимой h) или исчерпан бюджет.
+    В последнем случае генератор возвращает (как значение StopIteration)
+    BudgetExceeded: best — последнее решение или, если его нет, извлечённый
+    узел с наименьшей h; bound — наименьшее g + h по frontier (нижняя граница
+    стоимости оптимального решения при допустимой h).
+    """
+
+    def f(node):
+        return node.path_cost + weight * problem.h(node)
+
+    start_node = Node(problem.initial, path_cost=0)
+    frontier = PriorityQueue([start_node], key=f)
+    reached = {problem.initial: start_node}
+    incumbent = None
+    closest, closest_key = start_node, (problem.h(start_node), 0)
+
+    while len(frontier) > 0:
+        if budget is not None and budget.spend() is not None:
+            live = [n for _, n in frontier.items if reached.get(n.state) is n]
+            bound = min((n.path_cost + problem.h(n) for n in live), default=math.inf)
+            if incumbent is not None:
+                bound = min(bound, incumbent.path_cost)
+            best = closest if incumbent is None else incumbent
+            return BudgetExceeded(budget.reason, budget, best=best, bound=bound)
+        node = frontier.pop()
+        # Узел устарел или не может улучшить найденное решение
+        if reached.get(node.state) is not node:
+            continue
+        if incumbent is not None and node.path_cost + problem.h(node) >= incumbent.path_cost:
+            continue
+        node_key = (problem.h(node), -node.path_cost)
+        if node_key < closest_key:
+            closest, closest_key = node, node_key
+
+        if problem.is_goal(node.state):
+            incumbent = node
+            yield node
+            continue
+
+        for child in expand(problem, node):
+            if incumbent is not None and child.path_cost + problem.h(child) >= incumbent.path_cost:
+                continue
+            s = child.state
+            if s not in reached or child.path_cost < reached[s].path_cost:
+                reached[s] = child
+                frontier.add(child)
+
+
+def anytime_route(problem, weight=2.0, budget=None):
+    """
+    Лучший маршрут, найденный anytime_weighted_astar в пределах бюджета.
+    Возвращает узел с целевым состоянием, failure, если решения нет,
+    или BudgetExceeded (с ближайшим к цели узлом и нижней границей стоимости),
+    если бюджет исчерпан раньше первого решения.
+    """
+
+    best = None
+    search = anytime_weighted_astar(problem, weight=weight, budget=budget)
+    while True:
+        try:
+            best = next(search)
+        except StopIteration as stop:
+            exceeded = stop.value
+            break
+    if best is not None:
+        return best
+    if exceeded is not None:
+        return exceeded
+    return failure
+
+
+# Граф дорог между городами Австралии (веса рёбер — расстояния).
+CITIES_GRAPH = {
+    "Буриндал": {"Уоррен": 271, "Нинган": 156, "Кобар": 204},
+    "Уоррен": {"Буриндал": 271, "Нинган": 78, "Гилгандра": 103, "Нарромин": 86},
+    "Нинган": {"Буриндал": 156, "Канбелего": 86, "Уоррен": 78, "Бобада": 150, "Наймаджи": 122},
+    "Кобар": {"Буриндал": 204, "Канбелего": 50, "Наймаджи": 97.5, "Гулгуния": 110},
+    "Канбелего": {"Кобар": 50, "Наймаджи": 61, "Нинган": 86},
+    "Наймаджи": {"Канбелего": 61, "Нинган": 122, "Бобада": 150, "Кобар": 97.5, "Гулгуния": 46},
+    "Гулгуния": {"Кобар": 110, "Наймаджи": 46, "Матакана": 70},
+    "Матакана": {"Гулгуния": 70, "Лейк_Каргеллиго": 99},
+    "Бобада": {"Наймаджи": 150, "Нинган": 150, "Нарромин": 203, "Медроз": 50},
+    "Нарромин": {"Уоррен": 86, "Бобада": 203, "Пикхилл": 57, "Даббо": 41},
+    "Пикхилл": {"Нарромин": 57, "Даббо": 70, "Веллингтон": 109, "Медроз": 172, "Кондоболин": 147, "Паркс": 55},
+    "Даббо": {"Нарромин": 41, "Гилгандра": 66, "Данду": 88, "Веллингтон": 49, "Пикхилл": 70},
+    "Гилгандра": {"Уоррен": 103, "Даббо": 66, "Тураина": 49, "Данду": 92},
+    "Данду": {"Даббо": 88, "Маджи": 80, "Гилгандра": 92, "Кула": 47},
+    "Медроз": {"Бобада": 50, "Кондоболин": 56, "Пикхилл": 172},
+    "Кондоболин": {
+        "Медроз": 56,
+        "Паркс": 104,
+        "Гренфелл": 164,
+        "Уэст_Уайалонг": 104,
+        "Лейк_Каргеллиго": 94,
+        "Пикхилл": 147,
+    },
+    "Паркс": {"Пикхилл": 55, "Кондоболин": 104, "Гренфелл": 100, "Ориндж": 104},
+    "Гренфелл": {"Паркс": 100, "Ориндж": 139, "Кора": 58, "Янг": 53, "Кондоболин": 164, "Уэст_Уайалонг": 113},
+    "Ориндж": {"Кора": 104, "Паркс": 104, "Веллингтон": 105, "Батерст": 55, "Гренфелл": 139},
+    "Веллингтон": {"Маджи": 114, "Пикхилл": 109, "Даббо": 49, "Ориндж": 105},
+    "Маджи": {"Веллингтон": 114, "Данду": 80, "Меррива": 167, "Сеснок": 255, "Батерст": 134, "Литго": 126},
+    "Батерст": {"Литго": 62, "Кора": 106, "Круквелл": 155, "Ориндж": 55, "Маджи": 134},
+    "Литго": {"Батерст": 62, "Кетумба": 41, "Маджи": 126, "Госфорд": 174},
+    "Кора": {"Гренфелл": 58, "Ориндж": 104, "Батерст": 106, "Бурова": 78},
+    "Бурова": {"Янг": 47, "Кора": 78, "Круквелл": 85, "Гоулберн": 140},
+    "Круквелл": {"Батерст": 155, "Кетумба": 229, "Гоулберн": 43, "Бурова": 85},
+    "Гоулберн": {"Бурова": 140, "Круквелл": 43, "Нора": 125, "Боурал": 83},
+    "Нора": {"Гоулберн": 125, "Боурал": 66, "Киама": 55},
+    "Боурал": {"Нора": 66, "Киама": 77, "Вуллонгонг": 82, "Камден": 68, "Гоулберн": 83},
+    "Киама": {"Нора": 55, "Вуллонгонг": 43, "Боурал": 77},
+    "Вуллонгонг": {"Киама": 43, "Боурал": 82, "Камден": 72, "Сидней": 80},
+    "Камден": {"Боурал": 68, "Вуллонгонг": 72, "Кетумба": 96, "Сидней": 75},
+    "Сидней": {"Вуллонгонг": 80, "Камден": 75, "Кетумба": 106, "Вои_вои": 81},
+    "Кетумба": {"Литго": 41, "Сидней": 106, "Камден": 96, "Вои_вои": 156, "Круквелл": 229},
+    "Вои_вои": {"Сидней": 81, "Кетумба": 156, "Госфорд": 16},
+    "Госфорд": {"Вои_вои": 16, "Ньюкасл": 84, "Сеснок": 85, "Литго": 174},
+    "Ньюкасл": {"Госфорд": 84, "Сеснок": 45, "Мейтленд": 34, "Дангог": 104},
+    "Сеснок": {"Госфорд": 85, "Ньюкасл": 45, "Меррива": 159, "Синглтон": 53, "Маджи": 255},
+    "Мейтленд": {"Ньюкасл": 34, "Дангог": 53, "Синглтон": 48},
+    "Дангог": {"Ньюкасл": 104, "Мейтленд": 53},
+    "Синглтон": {"Сеснок": 53, "Мейтленд": 48, "Маселбрук": 49},
+    "Маселбрук": {"Синглтон": 49, "Меррива": 77},
+    "Меррива": {"Сеснок": 159, "Маселбрук": 77, "Кула": 81, "Маджи": 167},
+    "Кула": {"Меррива": 81, "Данду": 47, "Тураина": 132},
+    "Тураина": {"Кула": 132, "Гилгандра": 49},
+    "Лейк_Каргеллиго": {"Матакана": 99, "Кондоболин": 94, "Уэст_Уайалонг": 119},
+    "Уэст_Уайалонг": {"Лейк_Каргеллиго": 119, "Кондоболин": 104, "Гренфелл": 113, "Янг": 150},
+    "Янг": {"Уэст_Уайалонг": 150, "Гренфелл": 53, "Бурова": 47},
+}
+
+
 def main():
     """
     Главная функция программы.
     """
 
-    graph = {
-        "Буриндал": {"Уоррен": 271, "Нинган": 156, "Кобар": 204},
-        "Уоррен": {"Буриндал": 271, "Нинган": 78, "Гилгандра": 103, "Нарромин": 86},
-        "Нинган": {"Буриндал": 156, "Канбелего": 86, "Уоррен": 78, "Бобада": 150, "Наймаджи": 122},
-        "Кобар": {"Буриндал": 204, "Канбелего": 50, "Наймаджи": 97.5, "Гулгуния": 110},
-        "Канбелего": {"Кобар": 50, "Наймаджи": 61, "Нинган": 86},
-        "Наймаджи": {"Канбелего": 61, "Нинган": 122, "Бобада": 150, "Кобар": 97.5, "Гулгуния": 46},
-        "Гулгуния": {"Кобар": 110, "Наймаджи": 46, "Матакана": 70},
-        "Матакана": {"Гулгуния": 70, "Лейк_Каргеллиго": 99},
-        "Бобада": {"Наймаджи": 150, "Нинган": 150, "Нарромин": 203, "Медроз": 50},
-        "Нарромин": {"Уоррен": 86, "Бобада": 203, "Пикхилл": 57, "Даббо": 41},
-        "Пикхилл": {"Нарромин": 57, "Даббо": 70, "Веллингтон": 109, "Медроз": 172, "Кондоболин": 147, "Паркс": 55},
-        "Даббо": {"Нарромин": 41, "Гилгандра": 66, "Данду": 88, "Веллингтон": 49, "Пикхилл": 70},
-        "Гилгандра": {"Уоррен": 103, "Даббо": 66, "Тураина": 49, "Данду": 92},
-        "Данду": {"Даббо": 88, "Маджи": 80, "Гилгандра": 92, "Кула": 47},
-        "Медроз": {"Бобада": 50, "Кондоболин": 56, "Пикхилл": 172},
-        "Кондоболин": {
-            "Медроз": 56,
-            "Паркс": 104,
-            "Гренфелл": 164,
-            "Уэст_Уайалонг": 104,
-            "Лейк_Каргеллиго": 94,
-            "Пикхилл": 147,
-        },
-        "Паркс": {"Пикхилл": 55, "Кондоболин": 104, "Гренфелл": 100, "Ориндж": 104},
-        "Гренфелл": {"Паркс": 100, "Ориндж": 139, "Кора": 58, "Янг": 53, "Кондоболин": 164, "Уэст_Уайалонг": 113},
-        "Ориндж": {"Кора": 104, "Паркс": 104, "Веллингтон": 105, "Батерст": 55, "Гренфелл": 139},
-        "Веллингтон": {"Маджи": 114, "Пикхилл": 109, "Даббо": 49, "Ориндж": 105},
-        "Маджи": {"Веллингтон": 114, "Данду": 80, "Меррива": 167, "Сеснок": 255, "Батерст": 134, "Литго": 126},
-        "Батерст": {"Литго": 62, "Кора": 106, "Круквелл": 155, "Ориндж": 55, "Маджи": 134},
-        "Литго": {"Батерст": 62, "Кетумба": 41, "Маджи": 126, "Госфорд": 174},
-        "Кора": {"Гренфелл": 58, "Ориндж": 104, "Батерст": 106, "Бурова": 78},
-        "Бурова": {"Янг": 47, "Кора": 78, "Круквелл": 85, "Гоулберн": 140},
-        "Круквелл": {"Батерст": 155, "Кетумба": 229, "Гоулберн": 43, "Бурова": 85},
-        "Гоулберн": {"Бурова": 140, "Круквелл": 43, "Нора": 125, "Боурал": 83},
-        "Нора": {"Гоулберн": 125, "Боурал": 66, "Киама": 55},
-        "Боурал": {"Нора": 66, "Киама": 77, "Вуллонгонг": 82, "Камден": 68, "Гоулберн": 83},
-        "Киама": {"Нора": 55, "Вуллонгонг": 43, "Боурал": 77},
-        "Вуллонгонг": {"Киама": 43, "Боурал": 82, "Камден": 72, "Сидней": 80},
-        "Камден": {"Боурал": 68, "Вуллонгонг": 72, "Кетумба": 96, "Сидней": 75},
-        "Сидней": {"Вуллонгонг": 80, "Камден": 75, "Кетумба": 106, "Вои_вои": 81},
-        "Кетумба": {"Литго": 41, "Сидней": 106, "Камден": 96, "Вои_вои": 156, "Круквелл": 229},
-        "Вои_вои": {"Сидней": 81, "Кетумба": 156, "Госфорд": 16},
-        "Госфорд": {"Вои_вои": 16, "Ньюкасл": 84, "Сеснок": 85, "Литго": 174},
-        "Ньюкасл": {"Госфорд": 84, "Сеснок": 45, "Мейтленд": 34, "Дангог": 104},
-        "Сеснок": {"Госфорд": 85, "Ньюкасл": 45, "Меррива": 159, "Синглтон": 53, "Маджи": 255},
-        "Мейтленд": {"Ньюкасл": 34, "Дангог": 53, "Синглтон": 48},
-        "Дангог": {"Ньюкасл": 104, "Мейтленд": 53},
-        "Синглтон": {"Сеснок": 53, "Мейтленд": 48, "Маселбрук": 49},
-        "Маселбрук": {"Синглтон": 49, "Меррива": 77},
-        "Меррива": {"Сеснок": 159, "Маселбрук": 77, "Кула": 81, "Маджи": 167},
-        "Кула": {"Меррива": 81, "Данду": 47, "Тураина": 132},
-        "Тураина": {"Кула": 132, "Гилгандра": 49},
-        "Лейк_Каргеллиго": {"Матакана": 99, "Кондоболин": 94, "Уэст_Уайалонг": 119},
-        "Уэст_Уайалонг": {"Лейк_Каргеллиго": 119, "Кондоболин": 104, "Гренфелл": 113, "Янг": 150},
-        "Янг": {"Уэст_Уайалонг": 150, "Гренфелл": 53, "Бурова": 47},
-    }
-
     # Найдем кратчайший путь из города Буриндал в город Сидней:
-    problem = MapProblem(initial="Буриндал", goal="Сидней", graph=graph)
+    problem = MapProblem(initial="Буриндал", goal="Сидней", graph=CITIES_GRAPH)
 
     solution_node = breadth_first_search(problem)
     if solution_node is failure:
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Поиск в ширину во внешней памяти (на диске) для задачи WaterJugProblem.
+При большом числе кувшинов пространство состояний (произведение (size + 1)
+по всем кувшинам) не помещается в оперативную память, поэтому множество
+explored и очередь frontier из pitchers.bfs заменяются файлами:
+- каждый слой BFS записывается в отсортированный файл состояний;
+- потомки слоя собираются в блоки по block_size состояний, каждый блок
+  сортируется и записывается в отдельный файл-прогон (run);
+- прогоны сливаются потоково (heapq.merge), дубликаты удаляются,
+  а уже посещённые состояния вычитаются слиянием с файлом visited;
+- после нахождения цели план восстанавливается по сохранённым слоям
+  в обратном порядке: в предыдущем слое ищется состояние, из которого
+  одно действие ведёт в текущее.
+В памяти одновременно находится не больше O(block_size + fan_in) состояний.
+
+Переливания кувшинов необратимы (вылитую воду нельзя вернуть), поэтому
+сравнения только с двумя предыдущими слоями недостаточно: новые состояния
+вычитаются из накопленного отсортированного файла всех посещённых состояний.
+"""
+
+import heapq
+import os
+import tempfile
+import time
+
+from pitchers import (
+    Node,
+    WaterJugProblem,
+    bfs,
+    failure,
+    path_actions,
+    path_states,
+)
+
+
+def _write_states(path, states):
+    """Записать состояния (кортежи целых чисел) в файл, по одному в строке."""
+    count = 0
+    with open(path, "w") as f:
+        for state in states:
+            f.write(",".join(map(str, state)))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def _read_states(path):
+    """Потоково прочитать состояния из файла."""
+    with open(path) as f:
+        for line in f:
+            yield tuple(map(int, line.split(",")))
+
+
+def _unique(sorted_states):
+    """Удалить подряд идущие повторы из отсортированного потока."""
+    previous = None
+    for state in sorted_states:
+        if state != previous:
+            yield state
+            previous = state
+
+
+def _difference(sorted_states, sorted_visited):
+    """Состояния из sorted_states, которых нет в sorted_visited (оба потока отсортированы)."""
+    visited = iter(sorted_visited)
+    current = next(visited, None)
+    for state in sorted_states:
+        while current is not None and current < state:
+            current = next(visited, None)
+        if current != state:
+            yield state
+
+
+class ExternalBFS:
+    """
+    Поиск в ширину во внешней памяти.
+
+    :param problem: Задача с состояниями-кортежами целых чисел (например, WaterJugProblem).
+    :param block_size: Сколько состояний держать в памяти перед записью прогона.
+    :param fan_in: Сколько файлов сливать за один проход.
+    :param directory: Каталог для временных файлов (по умолчанию — системный).
+    """
+
+    def __init__(self, problem, block_size=100_000, fan_in=16, directory=None):
+        self.problem = problem
+        self.block_size = block_size
+        self.fan_in = fan_in
+        self.directory = directory
+        self.layer_sizes = []
+        self._files = 0
+
+    def _new_path(self, tmp):
+        self._files += 1
+        return os.path.join(tmp, f"{self._files}.states")
+
+    def _merge_files(self, tmp, paths):
+        """Слить отсортированные файлы, пока их не останется не больше fan_in."""
+        while len(paths) > self.fan_in:
+            merged = []
+            for i in range(0, len(paths), self.fan_in):
+                group = paths[i : i + self.fan_in]
+                path = self._new_path(tmp)
+                _write_states(path, _unique(heapq.merge(*(_read_states(p) for p in group))))
+                for p in group:
+                    os.remove(p)
+                merged.append(path)
+            paths = merged
+        return paths
+
+    def _expand_layer(self, tmp, layer_path):
+        """Потомки слоя: отсортированные прогоны по block_size состояний."""
+        problem = self.problem
+        runs = []
+        block = []
+        for state in _read_states(layer_path):
+            for action in problem.actions(state):
+                block.append(problem.result(state, action))
+                if len(block) >= self.block_size:
+                    runs.append(self._new_path(tmp))
+                    _write_states(runs[-1], sorted(set(block)))
+                    block = []
+        if block:
+            runs.append(self._new_path(tmp))
+            _write_states(runs[-1], sorted(set(block)))
+        return runs
+
+    def _reconstruct(self, layers, goal_state):
+        """Восстановить цепочку узлов до goal_state по файлам слоёв."""
+        problem = self.problem
+        steps = []
+        target = goal_state
+        for layer_path in reversed(layers[:-1]):
+            found = False
+            for state in _read_states(layer_path):
+                for action in problem.actions(state):
+                    if problem.result(state, action) == target:
+                        steps.append((state, action, target))
+                        target, found = state, True
+                        break
+                if found:
+                    break
+
+        node = Node(problem.initial)
+        for state, action, next_state in reversed(steps):
+            cost = node.path_cost + problem.action_cost(state, action, next_state)
+            node = Node(state=next_state, parent=node, action=action, path_cost=cost)
+        return node
+
+    def search(self):
+        """Возвращает узел с целевым состоянием или failure, как pitchers.bfs."""
+        problem = self.problem
+        self.layer_sizes = [1]
+        if problem.is_goal(problem.initial):
+            return Node(problem.initial)
+
+        with tempfile.TemporaryDirectory(dir=self.directory) as tmp:
+            layers = [self._new_path(tmp)]
+            _write_states(layers[0], [problem.initial])
+            visited_path = self._new_path(tmp)
+            _write_states(visited_path, [problem.initial])
+
+            while True:
+                runs = self._merge_files(tmp, self._expand_layer(tmp, layers[-1]))
+                goal_state = None
+
+                def new_states():
+                    nonlocal goal_state
+                    candidates = _unique(heapq.merge(*(_read_states(p) for p in runs)))
+                    for state in _difference(candidates, _read_states(visited_path)):
+                        if goal_state is None and problem.is_goal(state):
+                            goal_state = state
+                        yield state
+
+                layers.append(self._new_path(tmp))
+                size = _write_states(layers[-1], new_states())
+                for p in runs:
+                    os.remove(p)
+                if size == 0:
+                    return failure
+                self.layer_sizes.append(size)
+
+                if goal_state is not None:
+                    return self._reconstruct(layers, goal_state)
+
+                merged_path = self._new_path(tmp)
+                _write_states(merged_path, heapq.merge(_read_states(visited_path), _read_states(layers[-1])))
+                os.remove(visited_path)
+                visited_path = merged_path
+
+
+def external_bfs(problem, block_size=100_000, directory=None):
+    """
+    Поиск в ширину во внешней памяти.
+    Возвращает узел с целевым состоянием или failure, как pitchers.bfs.
+    """
+
+    return ExternalBFS(problem, block_size=block_size, directory=directory).search()
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    initial = (0, 0, 0, 0, 0)  # начальное состояние, пусть будут пустые
+    goal = 7  # целевой объем
+    sizes = (5, 6, 10, 15, 20)  # размеры кувшинов
+    problem = WaterJugProblem(initial, goal, sizes)
+
+    # Искусственно маленький бюджет памяти: 500 состояний в блоке
+    engine = ExternalBFS(problem, block_size=500, fan_in=4)
+    started = time.perf_counter()
+    solution_node = engine.search()
+    time_external = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reference = bfs(problem)
+    time_memory = time.perf_counter() - started
+
+    if solution_node is failure:
+        print("Решение не найдено!")
+    else:
+        print("Последовательность действий:", path_actions(solution_node))
+        print("Последовательность состояний:", path_states(solution_node))
+        print("Размеры слоёв BFS:", engine.layer_sizes)
+        print("Длина плана совпадает с pitchers.bfs:", len(path_actions(solution_node)) == len(path_actions(reference)))
+        print(f"Время: на диске {time_external:.3f} с, в памяти {time_memory:.3f} с")
+
+    # Недостижимая цель: обходится всё пространство состояний
+    problem = WaterJugProblem((0, 0, 0, 0), 1, (4, 6, 8, 10))
+    engine = ExternalBFS(problem, block_size=1000)
+    print("Нечётный объём из чётных кувшинов:", "не найдено" if engine.search() is failure else "найдено")
+    print("Посещено состояний:", sum(engine.layer_sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Инкрементное перепланирование (Lifelong Planning A*) для MapProblem и LabyrinthProblem.
+Планировщик хранит состояние поиска (g, rhs и очередь) между вызовами.
+При изменении веса ребра (update_edge) или клетки лабиринта (set_cell)
+пересчитываются только затронутые вершины, а не весь поиск заново.
+Начальное и целевое состояния задачи при этом не меняются.
+"""
+
+import heapq
+import itertools
+import math
+import time
+from abc import ABC, abstractmethod
+
+from example_bfs import (
+    CITIES_GRAPH,
+    MapProblem,
+    Node,
+    failure,
+    path_states,
+    single_source_search,
+)
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+
+
+class LifelongPlanningAStar(ABC):
+    """
+    Общая часть алгоритма LPA*.
+    Дочерний класс должен определить методы successors, predecessors и cost,
+    а при необходимости heuristic.
+    После каждого вызова compute_shortest_path в атрибуте expanded хранится
+    число раскрытых вершин (за этот вызов).
+    """
+
+    def __init__(self, start, goal):
+        self.start = start
+        self.goal = goal
+        self.g = {}
+        self.rhs = {start: 0}
+        self.queue = []
+        # Текущий ключ каждой вершины в очереди (устаревшие записи пропускаются)
+        self._keys = {}
+        self._counter = itertools.count()
+        self.expanded = 0
+        self._push(start)
+
+    @abstractmethod
+    def successors(self, s):
+        """Вернуть вершины, в которые ведут рёбра из s."""
+        pass
+
+    @abstractmethod
+    def predecessors(self, s):
+        """Вернуть вершины, из которых ведут рёбра в s."""
+        pass
+
+    @abstractmethod
+    def cost(self, a, b):
+        """Вернуть вес ребра a -> b (math.inf, если ребра нет)."""
+        pass
+
+    def heuristic(self, s):
+        """Эвристическая оценка расстояния от s до цели; по умолчанию = 0."""
+        return 0
+
+    def _key(self, s):
+        m = min(self.g.get(s, math.inf), self.rhs.get(s, math.inf))
+        return (m + self.heuristic(s), m)
+
+    def _push(self, s):
+        key = self._key(s)
+        self._keys[s] = key
+        heapq.heappush(self.queue, (key, next(self._counter), s))
+
+    def _top_key(self):
+        while self.queue:
+            key, _, s = self.queue[0]
+            if self._keys.get(s) == key:
+                return key
+            heapq.heappop(self.queue)
+        return (math.inf, math.inf)
+
+    def update_vertex(self, u):
+        """Пересчитать rhs(u) и поставить u в очередь, если она несогласована."""
+        if u != self.start:
+            self.rhs[u] = min(
+                (self.g.get(p, math.inf) + self.cost(p, u) for p in self.predecessors(u)),
+                default=math.inf,
+            )
+        self._keys.pop(u, None)
+        if self.g.get(u, math.inf) != self.rhs.get(u, math.inf):
+            self._push(u)
+
+    def compute_shortest_path(self):
+        """Довести до согласованности вершины, влияющие на кратчайший путь к цели."""
+        self.expanded = 0
+        goal = self.goal
+        while self._top_key() < self._key(goal) or self.rhs.get(goal, math.inf) != self.g.get(goal, math.inf):
+            if not self.queue:
+                break
+            _, _, u = heapq.heappop(self.queue)
+            del self._keys[u]
+            self.expanded += 1
+
+            if self.g.get(u, math.inf) > self.rhs.get(u, math.inf):
+                # Вершина стала дешевле — фиксируем новое значение
+                self.g[u] = self.rhs[u]
+            else:
+                # Вершина подорожала — сбрасываем и пересчитываем её саму
+                self.g[u] = math.inf
+                self.update_vertex(u)
+            for s in self.successors(u):
+                self.update_vertex(s)
+
+    def distance(self):
+        """Стоимость кратчайшего пути до цели (math.inf, если пути нет)."""
+        self.compute_shortest_path()
+        return self.g.get(self.goal, math.inf)
+
+    def path(self):
+        """Кратчайший путь от start до goal (список состояний) или None."""
+        if self.distance() == math.inf:
+            return None
+        path = [self.goal]
+        s = self.goal
+        while s != self.start:
+            s = min(self.predecessors(s), key=lambda p: self.g.get(p, math.inf) + self.cost(p, s))
+            path.append(s)
+        path.reverse()
+        return path
+
+
+class MapPlanner(LifelongPlanningAStar):
+    """
+    Инкрементный планировщик маршрутов для MapProblem.
+    Изменения весов вносятся методом update_edge прямо в problem.graph.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.graph = problem.graph
+        self._predecessors = {}
+        for u, neighbors in self.graph.items():
+            for v in neighbors:
+                self._predecessors.setdefault(v, set()).add(u)
+        super().__init__(problem.initial, problem.goal)
+
+    def successors(self, s):
+        return self.graph.get(s, {}).keys()
+
+    def predecessors(self, s):
+        return self._predecessors.get(s, ())
+
+    def cost(self, a, b):
+        return self.graph.get(a, {}).get(b, math.inf)
+
+    def heuristic(self, s):
+        return self.problem.h(Node(s))
+
+    def update_edge(self, a, b, w):
+        """
+        Изменить вес ребра a -> b на w (добавив ребро, если его не было).
+        При w = math.inf или None ребро удаляется.
+        """
+
+        if w is None or w == math.inf:
+            self.graph.get(a, {}).pop(b, None)
+            self._predecessors.get(b, set()).discard(a)
+        else:
+            self.graph.setdefault(a, {})[b] = w
+            self.graph.setdefault(b, {})
+            self._predecessors.setdefault(b, set()).add(a)
+        self.update_vertex(b)
+
+    def solve(self):
+        """Возвращает узел с целевым состоянием или failure, как breadth_first_search."""
+        route = self.path()
+        if route is None:
+            return failure
+        node = Node(route[0], path_cost=0)
+        for s1 in route[1:]:
+            node = Node(s1, parent=node, action=s1, path_cost=node.path_cost + self.cost(node.state, s1))
+        return node
+
+
+class LabyrinthPlanner(LifelongPlanningAStar):
+    """
+    Инкрементный планировщик для LabyrinthProblem.
+    Клетки переключаются между стеной и проходом методом set_cell
+    (изменение вносится прямо в problem.labyrinth).
+    """
+
+    DELTAS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.labyrinth = problem.labyrinth
+        super().__init__(problem.initial, problem.goal)
+
+    def _neighbors(self, s):
+        r, c = s
+        rows, cols = self.problem.rows, self.problem.cols
+        return [(r + dr, c + dc) for dr, dc in self.DELTAS if 0 <= r + dr < rows and 0 <= c + dc < cols]
+
+    def successors(self, s):
+        return self._neighbors(s)
+
+    def predecessors(self, s):
+        return self._neighbors(s)
+
+    def cost(self, a, b):
+        # Как и в LabyrinthProblem.actions, проверяется только клетка, в которую идём
+        return 1 if self.labyrinth[b[0]][b[1]] == 1 else math.inf
+
+    def heuristic(self, s):
+        return abs(s[0] - self.goal[0]) + abs(s[1] - self.goal[1])
+
+    def set_cell(self, r, c, v):
+        """Сделать клетку (r, c) проходом (v = 1) или стеной (v = 0)."""
+        if self.labyrinth[r][c] == v:
+            return
+        self.labyrinth[r][c] = v
+        # Меняется стоимость только входящих в клетку рёбер
+        self.update_vertex((r, c))
+
+    def solve(self):
+        """Возвращает длину пути или None, как bfs_labyrinth."""
+        distance = self.distance()
+        return None if distance == math.inf else distance
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    # Модель склада нужна только для демонстрации
+    from jump_point_search import warehouse_floor
+
+    # Маршрут по графу городов: пробка на одной из дорог маршрута
+    graph = {u: dict(neighbors) for u, neighbors in CITIES_GRAPH.items()}
+    problem = MapProblem(initial="Буриндал", goal="Сидней", graph=graph)
+    planner = MapPlanner(problem)
+    node = planner.solve()
+    print("Маршрут:", " -> ".join(path_states(node)), "| стоимость:", node.path_cost)
+    print("Раскрыто вершин при первом поиске:", planner.expanded)
+
+    planner.update_edge("Литго", "Кетумба", 400)
+    started = time.perf_counter()
+    node = planner.solve()
+    time_incremental = time.perf_counter() - started
+    expanded_incremental = planner.expanded
+
+    started = time.perf_counter()
+    fresh = MapPlanner(problem)
+    fresh.solve()
+    time_fresh = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reference = single_source_search(problem, goals=[problem.goal])[problem.goal]
+    time_dijkstra = time.perf_counter() - started
+
+    print("Новый маршрут:", " -> ".join(path_states(node)), "| стоимость:", node.path_cost)
+    print("Совпадает с поиском заново:", node.path_cost == reference.path_cost)
+    print(
+        f"Перепланирование: раскрыто {expanded_incremental}, {time_incremental * 1e6:.1f} мкс; "
+        f"поиск заново: раскрыто {fresh.expanded}, {time_fresh * 1e6:.1f} мкс; "
+        f"single_source_search: {time_dijkstra * 1e6:.1f} мкс"
+    )
+
+    # Лабиринт: на пути появляются и исчезают препятствия
+    floor = warehouse_floor(100, 100)
+    problem = LabyrinthProblem(floor, (0, 0), (99, 99))
+    planner = LabyrinthPlanner(problem)
+    print("Длина пути в лабиринте:", planner.solve(), "| раскрыто:", planner.expanded)
+
+    total_incremental = total_fresh = total_bfs = 0.0
+    expanded_incremental = expanded_fresh = 0
+    matches = True
+    changes = 10
+    for i in range(changes):
+        path = planner.path()
+        r, c = path[len(path) // 2 + i]
+        planner.set_cell(r, c, 0)
+
+        started = time.perf_counter()
+        distance = planner.solve()
+        total_incremental += time.perf_counter() - started
+        expanded_incremental += planner.expanded
+
+        started = time.perf_counter()
+        fresh = LabyrinthPlanner(problem)
+        fresh.solve()
+        total_fresh += time.perf_counter() - started
+        expanded_fresh += fresh.expanded
+
+        started = time.perf_counter()
+        matches = matches and bfs_labyrinth(problem) == distance
+        total_bfs += time.perf_counter() - started
+
+    print("Длина пути после изменений:", distance)
+    print("Совпадает с bfs_labyrinth после каждого изменения:", matches)
+    print(
+        f"В среднем на одно изменение: перепланирование — раскрыто {expanded_incremental // changes}, "
+        f"{total_incremental / changes * 1000:.2f} мс; поиск заново — раскрыто {expanded_fresh // changes}, "
+        f"{total_fresh / changes * 1000:.2f} мс; bfs_labyrinth — {total_bfs / changes * 1000:.2f} мс"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Поиск с прыжками по точкам (Jump Point Search) для лабиринта LabyrinthProblem.
+Лабиринт — бинарная матрица (1 – проход, 0 – стена), ходы — по четырём
+направлениям, каждый ход стоит 1. Вместо раскрытия каждой клетки поиск
+«перепрыгивает» прямые коридоры и открытые области и раскрывает только
+точки прыжка, поэтому на больших открытых пространствах число раскрытий
+уменьшается на порядки, а длина пути остаётся такой же, как у bfs_labyrinth.
+
+Используется каноническое упорядочивание путей «сначала по вертикали»:
+при движении по вертикали на каждой клетке проверяются горизонтальные прыжки,
+а при движении по горизонтали поворот возможен только у вынужденных соседей
+(соседняя клетка сверху/снизу открыта, а клетка перед ней закрыта).
+"""
+
+import heapq
+import time
+
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+
+
+class JumpPointSearch:
+    """
+    Движок JPS для задачи LabyrinthProblem.
+    После вызова search() в атрибуте expanded хранится число раскрытых точек прыжка.
+    Результаты прыжков кэшируются, поэтому вертикальные прыжки проходят каждую
+    клетку не более одного раза, а горизонтальные — по таблице строки.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.grid = problem.labyrinth
+        self.rows = problem.rows
+        self.cols = problem.cols
+        self.expanded = 0
+        # Результаты прыжков зависят только от лабиринта и цели, поэтому
+        # вычисляются один раз за поиск: горизонтальные — сразу для всей строки
+        # ((r, dc) -> список точек прыжка), вертикальные — для пройденных клеток
+        # ((r, c, dr) -> точка прыжка или None)
+        self._rows = {}
+        self._jumps = {}
+
+    def _passable(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.grid[r][c] == 1
+
+    def _row_jumps(self, r, dc):
+        """
+        Результаты горизонтальных прыжков из всех клеток строки r в направлении dc.
+        Вычисляются для всей строки сразу при первом обращении к ней.
+        """
+
+        key = (r, dc)
+        jumps = self._rows.get(key)
+        if jumps is not None:
+            return jumps
+
+        cols = self.cols
+        row = self.grid[r]
+        # Клетки, на которых прыжок останавливается: стены, цель и клетки
+        # с вынужденным соседом (сверху/снизу открыто, а позади него — стена)
+        stops = {c for c in range(cols) if row[c] != 1}
+        if self.problem.goal[0] == r:
+            stops.add(self.problem.goal[1])
+        for dr in (-1, 1):
+            if 0 <= r + dr < self.rows:
+                side = self.grid[r + dr]
+                behind = [0, *side[:-1]] if dc == 1 else [*side[1:], 0]
+                stops.update(c for c, (cell, back) in enumerate(zip(side, behind)) if cell == 1 and back != 1)
+
+        # Для каждой клетки — ближайшая остановка по направлению dc (стена — None)
+        jumps = [None] * cols
+        if dc == 1:
+            start = 0
+            for stop in sorted(stops):
+                jumps[start:stop] = [(r, stop) if row[stop] == 1 else None] * (stop - start)
+                start = stop
+        else:
+            end = cols
+            for stop in sorted(stops, reverse=True):
+                jumps[stop + 1 : end] = [(r, stop) if row[stop] == 1 else None] * (end - stop - 1)
+                end = stop + 1
+        self._rows[key] = jumps
+        return jumps
+
+    def _jump_horizontal(self, r, c, dc):
+        """Прыжок вдоль строки из (r, c); возвращает точку прыжка или None."""
+        return self._row_jumps(r, dc)[c]
+
+    def _jump_vertical(self, r, c, dr):
+        """Прыжок вдоль столбца из (r, c); возвращает точку прыжка или None."""
+        goal = self.problem.goal
+        key = (r, c, dr)
+        if key in self._jumps:
+            return self._jumps[key]
+        # Из обычной клетки прыжок даёт тот же результат, что и из следующей,
+        # поэтому результат запоминается для всех пройденных клеток
+        passed = [key]
+        while True:
+            r += dr
+            if not self._passable(r, c):
+                result = None
+                break
+            if (r, c) == goal:
+                result = (r, c)
+                break
+            # Клетка — точка прыжка, если из неё горизонтальный прыжок что-то находит
+            if self._jump_horizontal(r, c, -1) is not None or self._jump_horizontal(r, c, 1) is not None:
+                result = (r, c)
+                break
+            key = (r, c, dr)
+            if key in self._jumps:
+                result = self._jumps[key]
+                break
+            passed.append(key)
+        for key in passed:
+            self._jumps[key] = result
+        return result
+
+    def _directions(self, state, direction):
+        """Направления, в которых нужно прыгать из точки, достигнутой по direction."""
+        if direction is None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dr, dc = direction
+        if dr != 0:
+            return [(dr, 0), (0, 1), (0, -1)]
+        r, c = state
+        directions = [(0, dc)]
+        for side in (-1, 1):
+            if self._passable(r + side, c) and not self._passable(r + side, c - dc):
+                directions.append((side, 0))
+        return directions
+
+    def _jump(self, state, direction):
+        r, c = state
+        dr, dc = direction
+        if dr != 0:
+            return self._jump_vertical(r, c, dr)
+        return self._jump_horizontal(r, c, dc)
+
+    def search(self):
+        """
+        Поиск A* по точкам прыжка с манхэттенской эвристикой.
+        Возвращает словарь родителей точек прыжка и длину пути (или None).
+        """
+
+        start = self.problem.initial
+        goal = self.problem.goal
+        self.expanded = 0
+
+        def h(state):
+            return abs(state[0] - goal[0]) + abs(state[1] - goal[1])
+
+        g = {start: 0}
+        parents = {start: None}
+        closed = set()
+        frontier = [(h(start), 0, start, None)]
+
+        while frontier:
+            _, cost, state, direction = heapq.heappop(frontier)
+            if state in closed:
+                continue
+            if state == goal:
+                return parents, cost
+            closed.add(state)
+            self.expanded += 1
+
+            for d in self._directions(state, direction):
+                jump_point = self._jump(state, d)
+                if jump_point is None or jump_point in closed:
+                    continue
+                new_cost = cost + abs(jump_point[0] - state[0]) + abs(jump_point[1] - state[1])
+                if new_cost < g.get(jump_point, new_cost + 1):
+                    g[jump_point] = new_cost
+                    parents[jump_point] = state
+                    heapq.heappush(frontier, (new_cost + h(jump_point), new_cost, jump_point, d))
+
+        return parents, None
+
+
+def _unpack_path(parents, goal):
+    """Восстановить путь по клеткам, разворачивая прямые отрезки между точками прыжка."""
+    jump_points = []
+    state = goal
+    while state is not None:
+        jump_points.append(state)
+        state = parents[state]
+    jump_points.reverse()
+
+    path = [jump_points[0]]
+    for r1, c1 in jump_points[1:]:
+        r0, c0 = path[-1]
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        while (r0, c0) != (r1, c1):
+            r0, c0 = r0 + dr, c0 + dc
+            path.append((r0, c0))
+    return path
+
+
+def jps_labyrinth(problem, with_path=False):
+    """
+    Ищет кратчайший путь (по числу шагов) от problem.initial до problem.goal
+    с помощью Jump Point Search.
+    Возвращает длину пути или None, если путь не найден (как bfs_labyrinth);
+    при with_path=True возвращает пару (длина, список клеток пути) или None.
+    """
+
+    start = problem.initial
+    if start == problem.goal:
+        return (0, [start]) if with_path else 0
+
+    parents, distance = JumpPointSearch(problem).search()
+    if distance is None:
+        return None
+    if with_path:
+        return distance, _unpack_path(parents, problem.goal)
+    return distance
+
+
+class CountingLabyrinthProblem(LabyrinthProblem):
+    """LabyrinthProblem, подсчитывающий число раскрытий (вызовов actions)."""
+
+    def __init__(self, labyrinth, initial, goal):
+        super().__init__(labyrinth, initial, goal)
+        self.expanded = 0
+
+    def actions(self, state):
+        self.expanded += 1
+        return super().actions(state)
+
+
+def warehouse_floor(rows, cols, aisle=6):
+    """
+    Модель склада: открытое пространство со стеллажами (вертикальные
+    полосы стен), разорванными поперечными проходами.
+    """
+
+    floor = [[1] * cols for _ in range(rows)]
+    for c in range(aisle, cols - aisle, aisle):
+        for r in range(aisle, rows - aisle):
+            if r % (aisle * 4) != 0:
+                floor[r][c] = 0
+    return floor
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    floor = warehouse_floor(300, 300)
+    initial = (0, 0)
+    goal = (299, 299)
+
+    problem = CountingLabyrinthProblem(floor, initial, goal)
+    started = time.perf_counter()
+    distance_bfs = bfs_labyrinth(problem)
+    time_bfs = time.perf_counter() - started
+
+    engine = JumpPointSearch(LabyrinthProblem(floor, initial, goal))
+    started = time.perf_counter()
+    parents, distance_jps = engine.search()
+    time_jps = time.perf_counter() - started
+    path = _unpack_path(parents, goal)
+
+    print("Длина пути (BFS): ", distance_bfs, f"раскрыто клеток: {problem.expanded}, время: {time_bfs:.3f} с")
+    print("Длина пути (JPS): ", distance_jps, f"раскрыто точек прыжка: {engine.expanded}, время: {time_jps:.3f} с")
+    print("Клеток в восстановленном пути: ", len(path))
+
+
+if __name__ == "__main__":
+    main()
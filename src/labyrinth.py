@@ -10,6 +10,8 @@
 from abc import ABC, abstractmethod
 from collections import deque
 
+from search_budget import BudgetExceeded
+
 
 class Problem(ABC):
     """
@@ -69,11 +71,16 @@ class LabyrinthProblem(Problem):
         return action
 
 
-def bfs_labyrinth(problem):
+def bfs_labyrinth(problem, components=None, budget=None):
     """
     Ищет кратчайший путь (по числу шагов) от problem.initial до problem.goal
     с помощью алгоритма поиска в ширину (BFS).
     Возвращает длину пути или None, если путь не найден.
+    Если передан индекс компонент связности (components.ComponentIndex),
+    то при initial и goal в разных компонентах None возвращается сразу.
+    Если передан бюджет (search_budget.SearchBudget) и он исчерпан, возвращается
+    BudgetExceeded: best — клетка, ближайшая к цели (по манхэттенскому расстоянию),
+    bound — достигнутая глубина поиска (более короткого пути уже нет).
     """
 
     start = problem.initial
@@ -83,15 +90,30 @@ def bfs_labyrinth(problem):
     if start == goal:
         return 0
 
+    # Цель в другой компоненте связности — искать бесполезно
+    if components is not None and not components.connected(start, goal):
+        return None
+
     queue = deque([(start, 0)])
 
     # Посещенные состояния
     visited = set()
     visited.add(start)
+    if budget is not None:
+        best, best_h = start, abs(start[0] - goal[0]) + abs(start[1] - goal[1])
 
     while queue:
         (current, dist) = queue.popleft()
 
+        # Проверяем бюджет и запоминаем клетку, ближайшую к цели
+        if budget is not None:
+            reason = budget.spend()
+            if reason is not None:
+                return BudgetExceeded(reason, budget, best=best, bound=dist)
+            current_h = abs(current[0] - goal[0]) + abs(current[1] - goal[1])
+            if current_h < best_h:
+                best, best_h = current, current_h
+
         for action in problem.actions(current):
             next_state = problem.result(current, action)
             if next_state not in visited:
@@ -22,13 +22,15 @@ import math
 from abc import ABC, abstractmethod
 from collections import deque
 
+from search_budget import BudgetExceeded
+
 
 class Problem(ABC):
     """
     Абстрактный класс для формальной постановки задачи.
     Новый домен (конкретная задача) должен специализировать этот класс,
     переопределяя методы actions и result, а при необходимости
-    action_cost, h и is_goal.
+    action_cost, h, progress и is_goal.
     """
 
     def __init__(self, initial=None, goal=None, **kwargs):
@@ -59,6 +61,13 @@ class Problem(ABC):
         """Эвристика, по умолчанию 0."""
         return 0
 
+    def progress(self, node):
+        """
+        Близость узла к цели (меньше — ближе) для выбора лучшего частичного
+        результата при исчерпании бюджета поиска, по умолчанию эвристика.
+        """
+        return self.h(node)
+
 
 class Node:
 
@@ -111,9 +120,13 @@ def path_states(node):
     return path_states(node.parent) + [node.state]
 
 
-def bfs(problem):
+def bfs(problem, budget=None):
     """
     Функция алгоритма поиска в ширину.
+    Если передан бюджет (search_budget.SearchBudget) и он исчерпан, возвращается
+    BudgetExceeded: best — извлечённый узел, ближе всех подошедший к цели
+    (см. Problem.progress; из равных — с самым коротким путём), bound — глубина
+    последнего извлечённого узла (решения короче уже нет).
     """
 
     # Создаём начальный узел
@@ -128,11 +141,24 @@ def bfs(problem):
     # Набор посещённых состояний
     explored = set()
     explored.add(node.state)
+    if budget is not None:
+        best, best_progress = node, problem.progress(node)
 
     # Пока очередь не пуста
     while frontier:
         current = frontier.popleft()
 
+        # Проверяем бюджет и запоминаем узел, ближайший к цели
+        if budget is not None:
+            reason = budget.spend()
+            if reason is not None:
+                return BudgetExceeded(reason, budget, best=best, bound=len(path_actions(current)))
+            # Узлы извлекаются по возрастанию глубины, поэтому строгое сравнение
+            # оставляет из равных по близости к цели самый короткий путь
+            current_progress = problem.progress(current)
+            if current_progress < best_progress:
+                best, best_progress = current, current_progress
+
         # Расширяем текущий узел
         for child in expand(problem, current):
             if child.state not in explored:
@@ -166,6 +192,14 @@ class WaterJugProblem(Problem):
 
         return any(volume == self.goal for volume in state)
 
+    def progress(self, node):
+        """
+        Близость к цели: эвристика, а затем наименьшая разница между объёмом
+        воды в одном из кувшинов и целевым объёмом.
+        """
+
+        return self.h(node), min((abs(volume - self.goal) for volume in node.state), default=math.inf)
+
     def actions(self, state):
         """
         Действия:
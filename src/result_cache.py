@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Постоянный кэш результатов для всех четырёх решателей:
+bfs_labyrinth, count_islands_bfs, pitchers.bfs и breadth_first_search.
+Результаты хранятся в базе SQLite и адресуются по содержимому: ключ —
+хэш BLAKE2b от входных данных задачи (байты матрицы, граф или размеры
+кувшинов вместе с initial и goal). Размер кэша ограничен числом записей
+и/или объёмом в байтах, лишние записи вытесняются по принципу LRU.
+База работает в режиме WAL, поэтому ей могут одновременно пользоваться
+несколько процессов; чтение из кэша не блокирует другие процессы.
+Значения хранятся в формате JSON (а не pickle), поэтому чтение общего
+файла кэша не может выполнить чужой код. Для каждого решателя ведётся
+статистика попаданий.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from multiprocessing import Pool
+
+import example_bfs
+import pitchers
+from example_bfs import (
+    CITIES_GRAPH,
+    MapProblem,
+    breadth_first_search,
+    single_source_search,
+)
+from islands import count_islands_bfs
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+
+
+class ResultCache:
+    """
+    Кэш результатов в файле SQLite.
+
+    :param path: Путь к файлу базы.
+    :param max_entries: Наибольшее число записей (None — без ограничения).
+    :param max_bytes: Наибольший суммарный размер значений в байтах (None — без ограничения).
+    :param flush_every: Через сколько обращений записывать накопленную статистику
+        и время последнего использования записей.
+
+    Чтение не берёт блокировку на запись: статистика попаданий и время
+    использования копятся в памяти и записываются одной транзакцией — при
+    очередном put, раз в flush_every обращений, в stats() и при закрытии.
+    """
+
+    def __init__(self, path, max_entries=10_000, max_bytes=None, flush_every=256):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        # Ещё не записанные в базу обновления: solver -> [hits, misses] и key -> last_used
+        self._counts = {}
+        self._used = {}
+        self._lookups = 0
+        # Каждый процесс открывает своё соединение; транзакции управляются вручную
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key BLOB PRIMARY KEY, solver TEXT NOT NULL, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS stats ("
+            "solver TEXT PRIMARY KEY, hits INTEGER NOT NULL DEFAULT 0, misses INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, solver, key):
+        """
+        Возвращает пару (найдено ли, значение).
+        Кортежи в значении возвращаются списками, как после json.loads.
+        """
+
+        row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        found, value = False, None
+        if row is not None:
+            try:
+                found, value = True, json.loads(row[0])
+            except ValueError:
+                # Повреждённая запись (или запись старого формата) считается промахом и будет перезаписана
+                pass
+        counts = self._counts.setdefault(solver, [0, 0])
+        if found:
+            counts[0] += 1
+            self._used[key] = time.time()
+        else:
+            counts[1] += 1
+        self._lookups += 1
+        if self._lookups >= self.flush_every:
+            self.flush()
+        return found, value
+
+    def put(self, solver, key, value):
+        """
+        Сохранить значение и вытеснить давно не использованные записи.
+        Значение должно сериализоваться в JSON (числа, строки, None, списки, словари).
+        """
+
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            # Сначала накопленные обновления, чтобы вытеснение видело актуальное время использования
+            self._write_pending()
+            db.execute(
+                "INSERT OR REPLACE INTO results (key, solver, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, solver, data, len(data), time.time()),
+            )
+            self._evict()
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self._clear_pending()
+
+    def flush(self):
+        """Записать накопленную статистику и время использования записей."""
+        if not self._counts and not self._used:
+            self._lookups = 0
+            return
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_pending()
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self._clear_pending()
+
+    def _write_pending(self):
+        db = self._db
+        db.executemany(
+            "INSERT INTO stats (solver, hits, misses) VALUES (?, ?, ?) "
+            "ON CONFLICT (solver) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+            [(solver, hits, misses) for solver, (hits, misses) in self._counts.items()],
+        )
+        # MAX: другой процесс мог использовать запись позже
+        db.executemany(
+            "UPDATE results SET last_used = MAX(last_used, ?) WHERE key = ?",
+            [(used, key) for key, used in self._used.items()],
+        )
+
+    def _clear_pending(self):
+        self._counts = {}
+        self._used = {}
+        self._lookups = 0
+
+    def _evict(self):
+        db = self._db
+        if self.max_entries is not None:
+            (count,) = db.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.max_entries:
+                db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+        if self.max_bytes is not None:
+            (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+            rows = db.execute("SELECT key, size FROM results ORDER BY last_used")
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                evicted.append((key,))
+                total -= size
+            db.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def cached(self, solver, key, compute):
+        """Значение из кэша или, при промахе, результат compute(), сохранённый в кэш."""
+        found, value = self.get(solver, key)
+        if not found:
+            value = compute()
+            self.put(solver, key, value)
+        return value
+
+    def stats(self):
+        """Статистика попаданий по решателям и общее число записей."""
+        self.flush()
+        result = {}
+        for solver, hits, misses in self._db.execute("SELECT solver, hits, misses FROM stats ORDER BY solver"):
+            total = hits + misses
+            result[solver] = {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+        entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        result["entries"] = entries
+        result["bytes"] = size
+        return result
+
+
+def problem_key(solver, *parts):
+    """Ключ кэша: хэш BLAKE2b от имени решателя и входных данных задачи."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (solver, *parts):
+        data = part if isinstance(part, bytes) else repr(part).encode()
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.digest()
+
+
+def grid_bytes(grid):
+    """
+    Байтовое представление матрицы: число строк, затем длина и содержимое
+    каждой строки, поэтому матрицы с разной длиной строк не дают одинаковых
+    байтов. Если клетки не помещаются в байт (например, 1.0 или -1),
+    используется каноническое текстовое представление (repr) всей матрицы.
+    """
+
+    parts = [b"bytes:", len(grid).to_bytes(4, "little")]
+    try:
+        for row in grid:
+            parts.append(len(row).to_bytes(4, "little"))
+            parts.append(bytes(row))
+    except (TypeError, ValueError):
+        return b"repr:" + repr([list(row) for row in grid]).encode()
+    return b"".join(parts)
+
+
+def graph_bytes(graph):
+    """Каноническое представление графа, не зависящее от порядка ключей в словарях."""
+    items = sorted(
+        (repr(u), sorted((repr(v), repr(w)) for v, w in neighbors.items())) for u, neighbors in graph.items()
+    )
+    return repr(items).encode()
+
+
+def _node_steps(node):
+    """Цепочка узлов в виде списка (состояние, действие, стоимость пути) от корня."""
+    steps = []
+    while node is not None:
+        steps.append((node.state, node.action, node.path_cost))
+        node = node.parent
+    steps.reverse()
+    return steps
+
+
+def _tuples(value):
+    """Значение, прочитанное из JSON: списки (бывшие кортежи) снова становятся кортежами."""
+    if isinstance(value, list):
+        return tuple(_tuples(item) for item in value)
+    return value
+
+
+def _steps_node(steps, node_class):
+    """Восстановить цепочку узлов node_class из списка шагов (в том числе прочитанного из JSON)."""
+    node = None
+    for state, action, path_cost in steps:
+        node = node_class(_tuples(state), parent=node, action=_tuples(action), path_cost=path_cost)
+    return node
+
+
+def cached_bfs_labyrinth(cache, problem):
+    """bfs_labyrinth с кэшированием: длина пути или None."""
+    key = problem_key("bfs_labyrinth", grid_bytes(problem.labyrinth), problem.initial, problem.goal)
+    return cache.cached("bfs_labyrinth", key, lambda: bfs_labyrinth(problem))
+
+
+def cached_count_islands(cache, grid):
+    """count_islands_bfs с кэшированием: количество островов."""
+    key = problem_key("count_islands_bfs", grid_bytes(grid))
+    return cache.cached("count_islands_bfs", key, lambda: count_islands_bfs(grid))
+
+
+def cached_water_jug(cache, problem):
+    """pitchers.bfs с кэшированием: узел с целевым состоянием или pitchers.failure."""
+
+    def compute():
+        node = pitchers.bfs(problem)
+        return None if node is pitchers.failure else _node_steps(node)
+
+    key = problem_key("pitchers.bfs", tuple(problem.sizes), tuple(problem.initial), problem.goal)
+    steps = cache.cached("pitchers.bfs", key, compute)
+    return pitchers.failure if steps is None else _steps_node(steps, pitchers.Node)
+
+
+def cached_breadth_first_search(cache, problem):
+    """breadth_first_search с кэшированием: узел с целевым состоянием или failure."""
+
+    def compute():
+        node = breadth_first_search(problem)
+        return None if node is example_bfs.failure else _node_steps(node)
+
+    key = problem_key("breadth_first_search", graph_bytes(problem.graph), problem.initial, problem.goal)
+    steps = cache.cached("breadth_first_search", key, compute)
+    return example_bfs.failure if steps is None else _steps_node(steps, example_bfs.Node)
+
+
+def cached_route(cache, problem):
+    """
+    Кратчайший маршрут single_source_search с кэшированием: узел с целевым
+    состоянием или failure. В отличие от breadth_first_search завершается
+    и тогда, когда цель недостижима.
+    """
+
+    def compute():
+        node = single_source_search(problem, goals=[problem.goal]).get(problem.goal)
+        return None if node is None else _node_steps(node)
+
+    key = problem_key("single_source_search", graph_bytes(problem.graph), problem.initial, problem.goal)
+    steps = cache.cached("single_source_search", key, compute)
+    return example_bfs.failure if steps is None else _steps_node(steps, example_bfs.Node)
+
+
+def _nightly_job(args):
+    """Один «ночной» прогон: решает набор задач через общий кэш."""
+    path, goal = args
+    with ResultCache(path) as cache:
+        problem = MapProblem(initial="Буриндал", goal=goal, graph=CITIES_GRAPH)
+        node = cached_breadth_first_search(cache, problem)
+        jugs = pitchers.WaterJugProblem((0, 0, 0, 0, 0), 7, (5, 6, 10, 15, 20))
+        cached_water_jug(cache, jugs)
+        return goal, node.path_cost
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    labyrinth = [
+        [1, 0, 0, 0],
+        [1, 1, 1, 0],
+        [0, 0, 1, 1],
+    ]
+    grid = [
+        [1, 0, 0, 1],
+        [1, 1, 0, 0],
+        [0, 0, 0, 1],
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.sqlite")
+
+        with ResultCache(path, max_entries=100) as cache:
+            for _ in range(3):
+                print("Длина пути: ", cached_bfs_labyrinth(cache, LabyrinthProblem(labyrinth, (0, 0), (2, 3))))
+                print("Количество островов: ", cached_count_islands(cache, grid))
+
+        # Несколько процессов одновременно пользуются одним файлом кэша
+        goals = ["Сидней", "Ньюкасл", "Даббо", "Сидней", "Ньюкасл", "Даббо"] * 2
+        started = time.perf_counter()
+        with Pool(4) as pool:
+            results = pool.map(_nightly_job, [(path, goal) for goal in goals])
+        print(f"Маршруты ({time.perf_counter() - started:.2f} с):", sorted(set(results)))
+
+        with ResultCache(path) as cache:
+            for solver, stats in cache.stats().items():
+                print(f"{solver}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Асинхронный сервис маршрутизации поверх MapProblem.
+Граф городов загружается один раз и остаётся в памяти, а поиск выполняется
+в ограниченном пуле потоков, не блокируя цикл событий asyncio.
+Одинаковые одновременные запросы (initial, goal) объединяются в одно
+вычисление, а запросы с общим городом отправления группируются в один
+поиск из одного источника. Для запросов, поисков и ожидания в очереди
+ведутся гистограммы задержек.
+Сервис принимает запросы в формате JSON Lines по TCP или Unix-сокету,
+в модуле также есть простой клиент для нагрузочной проверки (p50/p99).
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from example_bfs import (
+    CITIES_GRAPH,
+    MapProblem,
+    failure,
+    path_states,
+    single_source_search,
+)
+
+
+def percentile(values, q):
+    """Процентиль q (от 0 до 100) для списка значений (метод ближайшего ранга)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с логарифмическими корзинами.
+    Граница корзины i равна base * factor ** i секунд, поэтому процентили
+    оцениваются с относительной погрешностью не более (factor - 1).
+    """
+
+    def __init__(self, base=1e-6, factor=1.25, buckets=100):
+        self.base = base
+        self.factor = factor
+        self.counts = [0] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, seconds):
+        if seconds <= self.base:
+            return 0
+        i = math.ceil(math.log(seconds / self.base, self.factor))
+        return min(i, len(self.counts) - 1)
+
+    def record(self, seconds):
+        """Учесть одно измерение (в секундах)."""
+        self.counts[self._bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Оценка квантиля q (от 0 до 1) — верхняя граница соответствующей корзины."""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self.base * self.factor**i, self.max)
+        return self.max
+
+    def snapshot(self):
+        """Сводка по гистограмме в виде словаря (в миллисекундах)."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.quantile(0.50) * 1000,
+            "p90_ms": self.quantile(0.90) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class RoutingService:
+    """
+    Сервис поиска маршрутов по графу, постоянно находящемуся в памяти.
+
+    :param graph: Граф городов (словарь словарей весов рёбер).
+    :param max_workers: Число потоков, в которых выполняются поиски.
+    :param batch_window: Сколько секунд ждать перед запуском поиска, чтобы
+        собрать в одну группу запросы с тем же городом отправления.
+    """
+
+    def __init__(self, graph, max_workers=4, batch_window=0.001):
+        self.graph = graph
+        self.max_workers = max_workers
+        self.batch_window = batch_window
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = None
+        # Вычисления в процессе: (initial, goal) -> Future
+        self._inflight = {}
+        # Группы, ещё не переданные в пул: initial -> {goal: Future}
+        self._batches = {}
+        self._tasks = set()
+        self.histograms = {
+            "request": LatencyHistogram(),
+            "queue": LatencyHistogram(),
+            "search": LatencyHistogram(),
+        }
+        self.counters = {"requests": 0, "coalesced": 0, "searches": 0, "goals_searched": 0}
+
+    async def route(self, initial, goal):
+        """
+        Найти кратчайший маршрут из initial в goal.
+        Возвращает узел с целевым состоянием или failure, как breadth_first_search.
+        """
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self.counters["requests"] += 1
+        key = (initial, goal)
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._inflight[key] = future
+            batch = self._batches.get(initial)
+            if batch is None:
+                batch = self._batches[initial] = {}
+                task = loop.create_task(self._run_batch(initial, time.perf_counter()))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            batch[goal] = future
+        else:
+            # Такой же запрос уже вычисляется — просто дожидаемся его результата
+            self.counters["coalesced"] += 1
+
+        try:
+            # shield: отмена одного клиента не должна отменять общий результат
+            return await asyncio.shield(future)
+        finally:
+            self.histograms["request"].record(time.perf_counter() - started)
+
+    async def _run_batch(self, initial, created):
+        """Выполнить один поиск из initial сразу для всех целей группы."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        await asyncio.sleep(self.batch_window)
+        async with self._slots:
+            # Пока ждали свободный поток, в группу могли добавиться новые цели
+            batch = self._batches.pop(initial)
+            self.histograms["queue"].record(time.perf_counter() - created)
+            self.counters["searches"] += 1
+            self.counters["goals_searched"] += len(batch)
+
+            problem = MapProblem(initial=initial, goal=None, graph=self.graph)
+            started = time.perf_counter()
+            try:
+                nodes = await loop.run_in_executor(self._executor, single_source_search, problem, list(batch))
+            except Exception as exc:
+                nodes, error = None, exc
+            else:
+                error = None
+            self.histograms["search"].record(time.perf_counter() - started)
+
+        for goal, future in batch.items():
+            self._inflight.pop((initial, goal), None)
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(nodes.get(goal, failure))
+
+    def stats(self):
+        """Счётчики и гистограммы задержек сервиса."""
+        return {
+            "counters": dict(self.counters),
+            "latency": {name: hist.snapshot() for name, hist in self.histograms.items()},
+        }
+
+    async def handle_client(self, reader, writer):
+        """
+        Обработка одного соединения: каждая строка — JSON-запрос
+        {"initial": ..., "goal": ...} или {"op": "stats"}, ответ — одна JSON-строка.
+        """
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise TypeError("запрос должен быть JSON-объектом")
+                    if request.get("op") == "stats":
+                        response = self.stats()
+                    else:
+                        node = await self.route(request["initial"], request["goal"])
+                        found = node is not failure
+                        response = {
+                            "initial": request["initial"],
+                            "goal": request["goal"],
+                            "route": path_states(node) if found else None,
+                            "cost": node.path_cost if found else None,
+                        }
+                except (ValueError, KeyError, TypeError) as exc:
+                    response = {"error": f"{type(exc).__name__}: {exc}"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=0, path=None):
+        """
+        Запустить сервер: на Unix-сокете path, если он задан, иначе на TCP host:port.
+        Возвращает объект asyncio.Server.
+        """
+
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=path)
+        return await asyncio.start_server(self.handle_client, host=host, port=port)
+
+    def close(self):
+        """Остановить пул потоков."""
+        self._executor.shutdown(wait=True)
+
+
+class RoutingClient:
+    """Простой клиент сервиса маршрутизации (одно соединение, запросы по очереди)."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=None, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _request(self, payload):
+        self.writer.write(json.dumps(payload, ensure_ascii=False).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def route(self, initial, goal):
+        return await self._request({"initial": initial, "goal": goal})
+
+    async def stats(self):
+        return await self._request({"op": "stats"})
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def load_test(connect, queries, concurrency=16):
+    """
+    Нагрузочная проверка: concurrency клиентов параллельно выполняют запросы
+    из queries. Возвращает список задержек (в секундах) со стороны клиента.
+
+    :param connect: Корутина без аргументов, создающая RoutingClient.
+    :param queries: Список пар (initial, goal).
+    """
+
+    pending = list(queries)
+    latencies = []
+
+    async def worker():
+        client = await connect()
+        try:
+            while pending:
+                initial, goal = pending.pop()
+                started = time.perf_counter()
+                await client.route(initial, goal)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def run_demo():
+    """Запуск сервиса и нагрузочная проверка по TCP и Unix-сокету."""
+    rng = random.Random(1)
+    cities = list(CITIES_GRAPH)
+    # Небольшой набор городов отправления, чтобы проявились объединение и группировка
+    origins = cities[:5]
+    queries = [(rng.choice(origins), rng.choice(cities)) for _ in range(2000)]
+
+    service = RoutingService(CITIES_GRAPH, max_workers=4)
+    try:
+        server = await service.serve()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            latencies = await load_test(lambda: RoutingClient.connect(port=port), queries, concurrency=32)
+        print(
+            f"TCP: запросов {len(latencies)}, p50 = {percentile(latencies, 50) * 1000:.3f} мс, "
+            f"p99 = {percentile(latencies, 99) * 1000:.3f} мс"
+        )
+
+        if hasattr(socket, "AF_UNIX"):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "routing.sock")
+                server = await service.serve(path=path)
+                async with server:
+                    latencies = await load_test(lambda: RoutingClient.connect(path=path), queries, concurrency=32)
+            print(
+                f"Unix-сокет: запросов {len(latencies)}, p50 = {percentile(latencies, 50) * 1000:.3f} мс, "
+                f"p99 = {percentile(latencies, 99) * 1000:.3f} мс"
+            )
+
+        stats = service.stats()
+        print("Счётчики сервиса:", stats["counters"])
+        for name, snapshot in stats["latency"].items():
+            print(f"Задержка '{name}': p50 = {snapshot['p50_ms']:.3f} мс, p99 = {snapshot['p99_ms']:.3f} мс")
+    finally:
+        service.close()
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    asyncio.run(run_demo())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Ограничение времени и числа раскрытий для поисков с возможностью отмены.
+Поиск получает объект SearchBudget и вызывает его метод spend() на каждом
+раскрытии узла. Проверка дешёвая: счётчик и флаг отмены проверяются каждый
+раз, а часы — только раз в check_every раскрытий. Когда бюджет исчерпан,
+поиск возвращает BudgetExceeded с лучшим частичным результатом вместо того,
+чтобы работать до конца.
+"""
+
+import math
+import random
+import threading
+import time
+
+
+class CancellationToken:
+    """Флаг отмены, который можно выставить из другого потока или обработчика."""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class SearchBudget:
+    """
+    Бюджет одного поиска. Отсчёт времени начинается при создании объекта.
+
+    :param time_limit: Ограничение времени в секундах (None — без ограничения).
+    :param max_nodes: Наибольшее число раскрытий (None — без ограничения).
+    :param token: CancellationToken для отмены поиска извне.
+    :param check_every: Как часто (в раскрытиях) сверяться с часами.
+    """
+
+    def __init__(self, time_limit=None, max_nodes=None, token=None, check_every=64):
+        self.started = time.perf_counter()
+        self.deadline = None if time_limit is None else self.started + time_limit
+        self.max_nodes = max_nodes
+        self.token = token
+        self.check_every = check_every
+        self.expanded = 0
+        self.reason = None
+
+    def spend(self):
+        """
+        Учесть одно раскрытие. Возвращает причину остановки
+        ("nodes", "cancelled" или "time") или None, если бюджет не исчерпан.
+        Исчерпанный бюджет остаётся исчерпанным, причина хранится в атрибуте reason.
+        """
+
+        self.expanded += 1
+        if self.reason is not None:
+            return self.reason
+        if self.max_nodes is not None and self.expanded > self.max_nodes:
+            self.reason = "nodes"
+        elif self.token is not None and self.token.cancelled:
+            self.reason = "cancelled"
+        elif self.deadline is not None and self.expanded % self.check_every == 0:
+            if time.perf_counter() >= self.deadline:
+                self.reason = "time"
+        return self.reason
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+class BudgetExceeded:
+    """
+    Результат поиска, прерванного по бюджету.
+
+    :param reason: Причина остановки: "nodes", "cancelled" или "time".
+    :param expanded: Число раскрытий до остановки.
+    :param elapsed: Затраченное время в секундах.
+    :param best: Лучший частичный результат (узел или состояние, ближайшее к цели).
+    :param bound: Нижняя граница стоимости решения, достигнутая поиском.
+    """
+
+    def __init__(self, reason, budget, best=None, bound=None):
+        self.reason = reason
+        self.expanded = budget.expanded
+        self.elapsed = budget.elapsed
+        self.best = best
+        self.bound = bound
+
+    def __repr__(self):
+        return (
+            f"<BudgetExceeded {self.reason}: expanded={self.expanded}, "
+            f"elapsed={self.elapsed:.3f}s, best={self.best!r}, bound={self.bound!r}>"
+        )
+
+
+def main():
+    """
+    Главная функция программы.
+    """
+
+    # Импорт здесь: example_bfs сам импортирует этот модуль
+    from example_bfs import (
+        CITIES_GRAPH,
+        MapProblem,
+        anytime_weighted_astar,
+        breadth_first_search,
+        single_source_search,
+    )
+    from labyrinth import LabyrinthProblem, bfs_labyrinth
+    from pitchers import WaterJugProblem, bfs
+
+    class RoadGridProblem(MapProblem):
+        """Дорожная сеть на плоскости: эвристика — расстояние по прямой до цели."""
+
+        def __init__(self, initial, goal, graph, coordinates):
+            super().__init__(initial, goal, graph)
+            self.coordinates = coordinates
+
+        def h(self, node):
+            (x1, y1), (x2, y2) = self.coordinates[node.state], self.coordinates[self.goal]
+            return math.hypot(x1 - x2, y1 - y2)
+
+    # Поиск в графе городов идёт без списка посещённых и работает долго — ограничим его 50 мс
+    problem = MapProblem(initial="Буриндал", goal="Сидней", graph=CITIES_GRAPH)
+    print("breadth_first_search:", breadth_first_search(problem, budget=SearchBudget(time_limit=0.05)))
+
+    # Отмена из другого потока
+    token = CancellationToken()
+    threading.Timer(0.02, token.cancel).start()
+    print("breadth_first_search с отменой:", breadth_first_search(problem, budget=SearchBudget(token=token)))
+
+    labyrinth = [[1] * 300 for _ in range(300)]
+    problem = LabyrinthProblem(labyrinth, (0, 0), (299, 299))
+    print("bfs_labyrinth:", bfs_labyrinth(problem, budget=SearchBudget(max_nodes=1000)))
+
+    problem = WaterJugProblem((0, 0, 0, 0), 1, (4, 6, 8, 10))
+    print("pitchers.bfs:", bfs(problem, budget=SearchBudget(max_nodes=50)))
+
+    # Anytime weighted A*: случайная дорожная сеть на сетке 60 x 60
+    rng = random.Random(7)
+    size = 60
+    coordinates = {(i, j): (i + rng.random() * 0.5, j + rng.random() * 0.5) for i in range(size) for j in range(size)}
+    graph = {v: {} for v in coordinates}
+    for (i, j), (x, y) in coordinates.items():
+        for n in ((i + 1, j), (i, j + 1), (i + 1, j + 1)):
+            if n in coordinates and rng.random() < 0.8:
+                w = math.hypot(x - coordinates[n][0], y - coordinates[n][1]) * rng.uniform(1.0, 2.0)
+                graph[(i, j)][n] = graph[n][(i, j)] = w
+    problem = RoadGridProblem((0, 0), (size - 1, size - 1), graph, coordinates)
+
+    budget = SearchBudget(time_limit=0.2)
+    last, solutions = None, 0
+    for last in anytime_weighted_astar(problem, weight=3.0, budget=budget):
+        if solutions == 0:
+            print(f"Первое решение: стоимость {last.path_cost:.2f}, {budget.elapsed * 1000:.1f} мс")
+        solutions += 1
+    if last is None:
+        print(f"Решение не найдено, раскрыто: {budget.expanded}")
+    else:
+        cost, improvements = last.path_cost, solutions - 1
+        print(f"Последнее решение: стоимость {cost:.2f}, улучшений: {improvements}, раскрыто: {budget.expanded}")
+    optimal = single_source_search(problem, goals=[problem.goal])[problem.goal]
+    print(f"Оптимальная стоимость: {optimal.path_cost:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Пакетное решение задач в формате JSON Lines.
+Каждая строка входа — одна задача:
+    {"type": "route", "initial": "Буриндал", "goal": "Сидней", "graph": {...}}
+    {"type": "maze", "labyrinth": [[1, 0], [1, 1]], "initial": [0, 0], "goal": [1, 1]}
+    {"type": "islands", "grid": [[1, 0], [0, 1]]}
+    {"type": "jugs", "sizes": [5, 6, 10], "goal": 7, "initial": [0, 0, 0]}
+Поле "graph" необязательно (по умолчанию — граф городов из example_bfs),
+"initial" для кувшинов по умолчанию — все кувшины пустые, поле "id"
+(если есть) копируется в ответ.
+Задачи читаются лениво и решаются конвейером генераторов с ограниченным
+числом задач в работе (и, при желании, в пуле процессов), а результаты
+выводятся в формате JSON Lines по мере готовности. В конце в stderr
+выводится пропускная способность (задач в секунду).
+
+Запуск из каталога src:
+    python -m solve_batch tasks.jsonl -o results.jsonl --workers 4
+    cat tasks.jsonl | python -m solve_batch
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.util import Finalize
+
+import pitchers
+from example_bfs import (
+    CITIES_GRAPH,
+    MapProblem,
+    failure,
+    path_states,
+    single_source_search,
+)
+from islands import count_islands_bfs
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+from result_cache import (
+    ResultCache,
+    cached_bfs_labyrinth,
+    cached_count_islands,
+    cached_route,
+    cached_water_jug,
+)
+
+
+# Кэш результатов текущего процесса (задаётся опцией --cache) и его закрытие
+_cache = None
+_close_cache = None
+
+
+def _init_worker(cache_path):
+    """
+    Подготовка процесса-исполнителя: открыть общий кэш, если он задан.
+    Кэш закрывается при завершении процесса, иначе накопленные счётчики
+    попаданий и отметки last_used не попадут в файл. atexit в процессах
+    пула не срабатывает (они завершаются через os._exit), поэтому
+    используется финализатор multiprocessing.
+    """
+
+    global _cache, _close_cache
+    if _close_cache is not None:
+        _close_cache()
+    _cache, _close_cache = None, None
+    if cache_path:
+        _cache = ResultCache(cache_path)
+        _close_cache = Finalize(_cache, _cache.close, exitpriority=0)
+
+
+def solve_route(task):
+    graph = task.get("graph", CITIES_GRAPH)
+    if task["initial"] not in graph:
+        raise KeyError(f"неизвестный город: {task['initial']!r}")
+    problem = MapProblem(initial=task["initial"], goal=task["goal"], graph=graph)
+    # Поиск по графу с учётом посещённых городов: завершается и при недостижимой цели
+    if _cache is not None:
+        node = cached_route(_cache, problem)
+    else:
+        node = single_source_search(problem, goals=[problem.goal]).get(problem.goal, failure)
+    if node is failure:
+        return {"route": None, "cost": None}
+    return {"route": path_states(node), "cost": node.path_cost}
+
+
+def solve_maze(task):
+    problem = LabyrinthProblem(task["labyrinth"], tuple(task["initial"]), tuple(task["goal"]))
+    if _cache is not None:
+        return {"distance": cached_bfs_labyrinth(_cache, problem)}
+    return {"distance": bfs_labyrinth(problem)}
+
+
+def solve_islands(task):
+    if _cache is not None:
+        return {"count": cached_count_islands(_cache, task["grid"])}
+    return {"count": count_islands_bfs(task["grid"])}
+
+
+def solve_jugs(task):
+    sizes = tuple(task["sizes"])
+    initial = tuple(task.get("initial", (0,) * len(sizes)))
+    problem = pitchers.WaterJugProblem(initial, task["goal"], sizes)
+    if _cache is not None:
+        node = cached_water_jug(_cache, problem)
+    else:
+        node = pitchers.bfs(problem)
+    if node is pitchers.failure:
+        return {"actions": None, "states": None}
+    return {"actions": pitchers.path_actions(node), "states": pitchers.path_states(node)}
+
+
+SOLVERS = {
+    "route": solve_route,
+    "maze": solve_maze,
+    "islands": solve_islands,
+    "jugs": solve_jugs,
+}
+
+
+def solve_line(item):
+    """
+    Решить одну задачу. item — пара (номер строки, текст строки).
+    Возвращает готовую строку JSON с результатом или описанием ошибки.
+    """
+
+    lineno, line = item
+    response = {"line": lineno}
+    try:
+        task = json.loads(line)
+        if "id" in task:
+            response["id"] = task["id"]
+        response["type"] = task.get("type")
+        solver = SOLVERS.get(task.get("type"))
+        if solver is None:
+            raise ValueError(f"неизвестный тип задачи: {task.get('type')!r}")
+        response.update(solver(task))
+    except (ValueError, KeyError, TypeError, IndexError, AttributeError) as exc:
+        response["error"] = f"{type(exc).__name__}: {exc}"
+    return json.dumps(response, ensure_ascii=False)
+
+
+def read_tasks(lines):
+    """Ленивое чтение непустых строк вместе с их номерами."""
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if line:
+            yield lineno, line
+
+
+def solve_stream(items, workers=1, max_in_flight=64, cache_path=None):
+    """
+    Решать задачи из items, выдавая результаты по мере готовности.
+    В работе одновременно находится не больше max_in_flight задач,
+    поэтому расход памяти не зависит от размера входа.
+    """
+
+    if workers <= 1:
+        _init_worker(cache_path)
+        try:
+            for item in items:
+                yield solve_line(item)
+        finally:
+            _init_worker(None)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_path,)) as pool:
+        pending = set()
+        for item in items:
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(solve_line, item))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def main(argv=None):
+    """
+    Главная функция программы.
+    """
+
+    parser = argparse.ArgumentParser(description="Пакетное решение задач поиска в формате JSON Lines.")
+    parser.add_argument("input", nargs="?", default="-", help="файл с задачами (по умолчанию stdin)")
+    parser.add_argument("-o", "--output", default="-", help="файл для результатов (по умолчанию stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="число процессов-исполнителей")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="наибольшее число задач в работе")
+    parser.add_argument("--cache", default=None, help="файл кэша результатов (SQLite)")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    started = time.perf_counter()
+    count = 0
+    try:
+        items = read_tasks(source)
+        for result in solve_stream(items, args.workers, max(1, args.max_in_flight), args.cache):
+            target.write(result + "\n")
+            target.flush()
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Решено задач: {count} за {elapsed:.3f} с ({rate:.1f} задач/с)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+
+import pytest
+
+from components import ComponentIndex
+from example_bfs import MapProblem, breadth_first_search, failure
+from islands import count_islands_bfs
+from jump_point_search import CountingLabyrinthProblem
+from labyrinth import bfs_labyrinth
+
+
+class CountingMapProblem(MapProblem):
+    """MapProblem, подсчитывающий число раскрытий (вызовов actions)."""
+
+    def __init__(self, initial, goal, graph):
+        super().__init__(initial, goal, graph)
+        self.expanded = 0
+
+    def actions(self, state):
+        self.expanded += 1
+        return super().actions(state)
+
+
+def random_grid(rng, rows, cols, density=0.55):
+    return [[1 if rng.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+
+
+def assert_same_partition(index, fresh, states):
+    assert index.count == fresh.count
+    for a, b in itertools.combinations(states, 2):
+        assert index.connected(a, b) == fresh.connected(a, b)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_islands_count(seed):
+    rng = random.Random(seed)
+    grid = random_grid(rng, rng.randint(1, 15), rng.randint(1, 15), rng.random())
+    assert ComponentIndex.for_islands(grid).count == count_islands_bfs(grid)
+
+
+def test_labyrinth_rejects_other_component_without_search():
+    labyrinth = [
+        [1, 1, 0, 1, 1],
+        [1, 1, 0, 1, 1],
+        [1, 1, 0, 1, 1],
+    ]
+    problem = CountingLabyrinthProblem(labyrinth, (0, 0), (2, 4))
+    index = ComponentIndex.for_labyrinth(problem)
+    problem.expanded = 0
+
+    assert bfs_labyrinth(problem, components=index) is None
+    assert problem.expanded == 0
+
+    problem = CountingLabyrinthProblem(labyrinth, (0, 0), (2, 1))
+    assert bfs_labyrinth(problem, components=index) == 3
+    assert problem.expanded > 0
+
+
+def test_map_rejects_other_component_without_search():
+    # Цикл A <-> B <-> C и отдельная пара D <-> E: поиск без индекса ходит по циклу бесконечно
+    graph = {"A": {"B": 1}, "B": {"A": 1, "C": 2}, "C": {"B": 2}, "D": {"E": 1}, "E": {"D": 1}}
+    problem = CountingMapProblem("A", "E", graph)
+    index = ComponentIndex.for_map(problem)
+    problem.expanded = 0
+
+    assert breadth_first_search(problem, components=index) is failure
+    assert problem.expanded == 0
+
+    problem = CountingMapProblem("A", "C", graph)
+    assert breadth_first_search(problem, components=index).path_cost == 3
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_labyrinth_updates_match_rebuild(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(2, 7), rng.randint(2, 7)
+    labyrinth = random_grid(rng, rows, cols)
+    problem = CountingLabyrinthProblem(labyrinth, (0, 0), (rows - 1, cols - 1))
+    index = ComponentIndex.for_labyrinth(problem)
+    cells = [(r, c) for r in range(rows) for c in range(cols)]
+
+    for _ in range(25):
+        r, c = rng.choice(cells)
+        if labyrinth[r][c] == 1:
+            labyrinth[r][c] = 0
+            index.state_removed((r, c))
+        else:
+            labyrinth[r][c] = 1
+            index.state_added((r, c))
+        fresh = ComponentIndex.for_labyrinth(problem)
+        passable = [(r, c) for r, c in cells if labyrinth[r][c] == 1]
+        assert_same_partition(index, fresh, passable)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_graph_updates_match_rebuild(seed):
+    rng = random.Random(seed)
+    vertices = list(range(10))
+    graph = {v: {} for v in vertices}
+    problem = MapProblem(0, 9, graph)
+    index = ComponentIndex.for_map(problem)
+
+    for _ in range(30):
+        a, b = rng.sample(vertices, 2)
+        if b in graph[a] and rng.random() < 0.5:
+            del graph[a][b]
+            index.edge_removed(a, b)
+        else:
+            graph[a][b] = rng.randint(1, 9)
+            index.edge_added(a, b)
+        assert_same_partition(index, ComponentIndex.for_map(problem), vertices)
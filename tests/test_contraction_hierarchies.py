@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+
+import pytest
+
+import example_bfs
+from contraction_hierarchies import ContractionHierarchy, ch_search
+from example_bfs import CITIES_GRAPH, MapProblem, failure, path_states
+
+
+# Небольшой ориентированный граф: рёбра в одну сторону, одна вершина недостижима
+DIRECTED_GRAPH = {
+    "A": {"B": 4, "C": 1},
+    "B": {"D": 1},
+    "C": {"B": 2, "D": 6},
+    "D": {"A": 3, "E": 2},
+    "E": {},
+    "F": {"A": 1},
+}
+
+
+def assert_matches_single_source(hierarchy, graph, initial, goal):
+    problem = MapProblem(initial=initial, goal=goal, graph=graph)
+    expected = example_bfs.single_source_search(problem, goals=[goal]).get(goal)
+    node = ch_search(hierarchy, problem)
+    if expected is None:
+        assert node is failure
+        return
+    assert node.path_cost == expected.path_cost
+    route = path_states(node)
+    assert route[0] == initial
+    assert route[-1] == goal
+    assert sum(graph[a][b] for a, b in zip(route, route[1:])) == expected.path_cost
+
+
+def test_city_graph():
+    hierarchy = ContractionHierarchy.build(CITIES_GRAPH)
+    cities = list(CITIES_GRAPH)
+    for initial in cities[::5]:
+        for goal in cities:
+            assert_matches_single_source(hierarchy, CITIES_GRAPH, initial, goal)
+
+
+def test_directed_graph():
+    hierarchy = ContractionHierarchy.build(DIRECTED_GRAPH)
+    for initial, goal in itertools.product(DIRECTED_GRAPH, repeat=2):
+        assert_matches_single_source(hierarchy, DIRECTED_GRAPH, initial, goal)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_save_load_round_trip_with_tuple_vertices(tmp_path, seed):
+    rng = random.Random(seed)
+    vertices = [(i, i % 3) for i in range(25)]
+    graph = {v: {} for v in vertices}
+    for _ in range(80):
+        u, v = rng.sample(vertices, 2)
+        graph[u][v] = rng.randint(1, 9)
+
+    hierarchy = ContractionHierarchy.build(graph)
+    path = tmp_path / "graph.ch.json"
+    hierarchy.save(path)
+    loaded = ContractionHierarchy.load(path)
+
+    assert loaded.rank == hierarchy.rank
+    assert loaded.up_out == hierarchy.up_out
+    assert loaded.up_in == hierarchy.up_in
+    assert loaded.middle == hierarchy.middle
+    for initial, goal in itertools.product(vertices[::4], vertices):
+        assert_matches_single_source(loaded, graph, initial, goal)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from external_bfs import ExternalBFS
+from pitchers import WaterJugProblem, bfs, failure, path_actions
+
+
+PROBLEMS = [
+    ((0, 0), 2, (3, 4)),
+    ((0, 0, 0), 7, (5, 6, 10)),
+    ((0, 0, 0, 0), 9, (4, 7, 11, 13)),
+    ((1, 0, 0), 1, (3, 5, 7)),
+]
+
+
+def reachable_states(problem):
+    reached = {problem.initial}
+    frontier = [problem.initial]
+    while frontier:
+        state = frontier.pop()
+        for action in problem.actions(state):
+            child = problem.result(state, action)
+            if child not in reached:
+                reached.add(child)
+                frontier.append(child)
+    return reached
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 7, 1000])
+@pytest.mark.parametrize("initial, goal, sizes", PROBLEMS)
+def test_plan_matches_in_memory_bfs(tmp_path, block_size, initial, goal, sizes):
+    problem = WaterJugProblem(initial, goal, sizes)
+    node = ExternalBFS(problem, block_size=block_size, fan_in=2, directory=tmp_path).search()
+    reference = bfs(problem)
+
+    assert node is not failure
+    actions = path_actions(node)
+    assert len(actions) == len(path_actions(reference))
+
+    # План воспроизводится из initial и приводит к цели
+    state = problem.initial
+    for action in actions:
+        state = problem.result(state, action)
+    assert state == node.state
+    assert problem.is_goal(state)
+    assert node.path_cost == len(actions)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 1000])
+def test_unreachable_goal(tmp_path, block_size):
+    # Из кувшинов чётного объёма нечётный объём не получить
+    problem = WaterJugProblem((0, 0, 0), 3, (2, 4, 6))
+    engine = ExternalBFS(problem, block_size=block_size, fan_in=2, directory=tmp_path)
+
+    assert engine.search() is failure
+    assert bfs(problem) is failure
+    # Обойдено всё достижимое пространство состояний, каждое состояние — один раз
+    assert sum(engine.layer_sizes) == len(reachable_states(problem))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import random
+
+import pytest
+
+import example_bfs
+import incremental_planning
+from example_bfs import CITIES_GRAPH, MapProblem, failure, path_states
+from incremental_planning import LabyrinthPlanner, MapPlanner
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+
+
+def assert_matches_fresh_search(planner, problem):
+    expected = example_bfs.single_source_search(problem, goals=[problem.goal]).get(problem.goal)
+    node = planner.solve()
+    if expected is None:
+        assert node is failure
+        return
+    assert node.path_cost == expected.path_cost
+    route = path_states(node)
+    assert route[0] == problem.initial
+    assert route[-1] == problem.goal
+    assert sum(problem.graph[a][b] for a, b in zip(route, route[1:])) == node.path_cost
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        incremental_planning.LifelongPlanningAStar("A", "B")
+
+
+def test_city_graph_updates():
+    graph = {u: dict(neighbors) for u, neighbors in CITIES_GRAPH.items()}
+    problem = MapProblem(initial="Буриндал", goal="Сидней", graph=graph)
+    planner = MapPlanner(problem)
+    assert_matches_fresh_search(planner, problem)
+
+    # Пробка, удаление дороги и новая дорога
+    for a, b, w in [
+        ("Литго", "Кетумба", 400),
+        ("Кетумба", "Сидней", math.inf),
+        ("Буриндал", "Камден", 500),
+        ("Литго", "Кетумба", 41),
+    ]:
+        planner.update_edge(a, b, w)
+        assert_matches_fresh_search(planner, problem)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_graph_updates(seed):
+    rng = random.Random(seed)
+    n = 15
+    graph = {v: {} for v in range(n)}
+    for _ in range(40):
+        a, b = rng.sample(range(n), 2)
+        graph[a][b] = rng.randint(1, 9)
+    problem = MapProblem(initial=0, goal=n - 1, graph=graph)
+    planner = MapPlanner(problem)
+    assert_matches_fresh_search(planner, problem)
+
+    for _ in range(30):
+        a, b = rng.sample(range(n), 2)
+        w = math.inf if rng.random() < 0.4 else rng.randint(1, 9)
+        planner.update_edge(a, b, w)
+        assert_matches_fresh_search(planner, problem)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_labyrinth_cell_updates(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(3, 10), rng.randint(3, 10)
+    labyrinth = [[1 if rng.random() < 0.7 else 0 for _ in range(cols)] for _ in range(rows)]
+    initial, goal = (0, 0), (rows - 1, cols - 1)
+    labyrinth[0][0] = labyrinth[rows - 1][cols - 1] = 1
+    problem = LabyrinthProblem(labyrinth, initial, goal)
+    planner = LabyrinthPlanner(problem)
+    assert planner.solve() == bfs_labyrinth(problem)
+
+    for _ in range(40):
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        if (r, c) == initial:
+            continue
+        planner.set_cell(r, c, 1 - labyrinth[r][c])
+        assert planner.solve() == bfs_labyrinth(problem)
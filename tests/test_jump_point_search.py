@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from jump_point_search import JumpPointSearch, jps_labyrinth, warehouse_floor
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+
+
+def assert_valid_path(labyrinth, initial, goal, distance, path):
+    assert len(path) == distance + 1
+    assert path[0] == initial
+    assert path[-1] == goal
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        assert abs(r0 - r1) + abs(c0 - c1) == 1
+        assert labyrinth[r1][c1] == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_bfs_on_random_grids(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+        density = rng.random()
+        labyrinth = [[1 if rng.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+        free = [(r, c) for r in range(rows) for c in range(cols) if labyrinth[r][c] == 1]
+        if not free:
+            continue
+        initial, goal = rng.choice(free), rng.choice(free)
+
+        expected = bfs_labyrinth(LabyrinthProblem(labyrinth, initial, goal))
+        assert jps_labyrinth(LabyrinthProblem(labyrinth, initial, goal)) == expected
+        result = jps_labyrinth(LabyrinthProblem(labyrinth, initial, goal), with_path=True)
+        if expected is None:
+            assert result is None
+        else:
+            distance, path = result
+            assert distance == expected
+            assert_valid_path(labyrinth, initial, goal, distance, path)
+
+
+def test_tuple_grid():
+    labyrinth = ((1, 1, 1), (0, 0, 1), (1, 1, 1))
+    problem = LabyrinthProblem(labyrinth, (0, 0), (2, 0))
+    assert bfs_labyrinth(problem) == 6
+    distance, path = jps_labyrinth(LabyrinthProblem(labyrinth, (0, 0), (2, 0)), with_path=True)
+    assert distance == 6
+    assert_valid_path(labyrinth, (0, 0), (2, 0), distance, path)
+
+
+def test_warehouse_floor_expands_few_jump_points():
+    floor = warehouse_floor(120, 120)
+    problem = LabyrinthProblem(floor, (0, 0), (119, 119))
+    engine = JumpPointSearch(problem)
+    _, distance = engine.search()
+    assert distance == bfs_labyrinth(LabyrinthProblem(floor, (0, 0), (119, 119)))
+    assert engine.expanded < 120 * 120 // 20
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import time
+
+import pytest
+
+import example_bfs
+import pitchers
+import result_cache
+from islands import count_islands_bfs
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+from result_cache import ResultCache, grid_bytes
+
+
+GRAPH = {"A": {"B": 1, "C": 4}, "B": {"C": 1, "D": 5}, "C": {"D": 1}, "D": {}}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "results.sqlite")
+
+
+def test_hits_and_misses_survive_close(path):
+    grid = [[1, 0], [0, 1]]
+    with ResultCache(path) as cache:
+        for _ in range(3):
+            assert result_cache.cached_count_islands(cache, grid) == 1
+
+    with ResultCache(path) as cache:
+        assert result_cache.cached_count_islands(cache, grid) == 1
+        stats = cache.stats()
+    assert stats["count_islands_bfs"]["hits"] == 3
+    assert stats["count_islands_bfs"]["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_flush_every_writes_counters_without_close(path):
+    cache = ResultCache(path, flush_every=2)
+    cache.put("s", b"k", 1)
+    cache.get("s", b"k")
+    cache.get("s", b"missing")
+    with ResultCache(path) as other:
+        assert other.stats()["s"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    cache.close()
+
+
+def test_lru_eviction_by_entries(path):
+    with ResultCache(path, max_entries=2) as cache:
+        cache.put("s", b"a", 1)
+        time.sleep(0.002)
+        cache.put("s", b"b", 2)
+        time.sleep(0.002)
+        # Обращение к a делает b самой давно использованной записью
+        assert cache.get("s", b"a") == (True, 1)
+        time.sleep(0.002)
+        cache.put("s", b"c", 3)
+
+        assert cache.get("s", b"b") == (False, None)
+        assert cache.get("s", b"a") == (True, 1)
+        assert cache.get("s", b"c") == (True, 3)
+        assert cache.stats()["entries"] == 2
+
+
+def test_lru_eviction_by_bytes(path):
+    value = "x" * 100
+    with ResultCache(path, max_entries=None, max_bytes=250) as cache:
+        for key in (b"a", b"b"):
+            cache.put("s", key, value)
+            time.sleep(0.002)
+        assert cache.get("s", b"a") == (True, value)
+        time.sleep(0.002)
+        cache.put("s", b"c", value)
+
+        assert cache.get("s", b"b") == (False, None)
+        assert cache.get("s", b"a") == (True, value)
+        assert cache.stats()["bytes"] <= 250
+
+
+def test_ragged_grids_have_different_keys():
+    assert grid_bytes([[1, 0], [1]]) != grid_bytes([[1], [0, 1]])
+    assert grid_bytes([[1, 1, 0]]) != grid_bytes([[1], [1, 0]])
+    assert grid_bytes([]) != grid_bytes([[]])
+
+
+def test_cells_outside_byte_range_do_not_change_answers(path):
+    grid = [[1.0, 0], [0, 1]]
+    labyrinth = [[1, -1], [1, 1]]
+    with ResultCache(path) as cache:
+        for _ in range(2):
+            assert result_cache.cached_count_islands(cache, grid) == count_islands_bfs(grid)
+            problem = LabyrinthProblem(labyrinth, (0, 0), (1, 1))
+            assert result_cache.cached_bfs_labyrinth(cache, problem) == bfs_labyrinth(problem) == 2
+    assert grid_bytes([[1.0, 0]]) != grid_bytes([[1, 0]])
+
+
+def test_water_jug_round_trip(path):
+    problem = pitchers.WaterJugProblem((0, 0, 0), 7, (5, 6, 10))
+    expected = pitchers.bfs(problem)
+    with ResultCache(path) as cache:
+        first = result_cache.cached_water_jug(cache, problem)
+    with ResultCache(path) as cache:
+        second = result_cache.cached_water_jug(cache, problem)
+        assert cache.stats()["pitchers.bfs"]["hits"] == 1
+
+    for node in (first, second):
+        assert pitchers.path_states(node) == pitchers.path_states(expected)
+        assert pitchers.path_actions(node) == pitchers.path_actions(expected)
+        assert node.path_cost == expected.path_cost
+
+    unreachable = pitchers.WaterJugProblem((0, 0), 3, (2, 4))
+    with ResultCache(path) as cache:
+        for _ in range(2):
+            assert result_cache.cached_water_jug(cache, unreachable) is pitchers.failure
+
+
+@pytest.mark.parametrize("search", [result_cache.cached_breadth_first_search, result_cache.cached_route])
+def test_route_round_trip(path, search):
+    problem = example_bfs.MapProblem("A", "D", GRAPH)
+    with ResultCache(path) as cache:
+        nodes = [search(cache, problem) for _ in range(2)]
+    for node in nodes:
+        assert example_bfs.path_states(node) == ["A", "B", "C", "D"]
+        assert example_bfs.path_actions(node) == ["B", "C", "D"]
+        assert node.path_cost == 3
+
+
+def _worker(args):
+    path, grids = args
+    with ResultCache(path) as cache:
+        return [result_cache.cached_count_islands(cache, grid) for grid in grids]
+
+
+def test_two_processes_share_one_file(path):
+    grids = [[[1, 0, i % 2], [0, 1, 1]] for i in range(6)] * 5
+    with multiprocessing.Pool(2) as pool:
+        results = pool.map(_worker, [(path, grids), (path, grids[::-1])])
+
+    assert results[0] == [count_islands_bfs(grid) for grid in grids]
+    assert results[1] == results[0][::-1]
+    with ResultCache(path) as cache:
+        stats = cache.stats()
+    counts = stats["count_islands_bfs"]
+    assert counts["hits"] + counts["misses"] == 2 * len(grids)
+    assert stats["entries"] == 2
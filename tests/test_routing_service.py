@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import socket
+import tempfile
+
+import pytest
+
+import example_bfs
+import routing_service
+from example_bfs import CITIES_GRAPH, MapProblem, failure, path_states
+from routing_service import RoutingClient, RoutingService, load_test
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def reference_cost(initial, goal):
+    return example_bfs.single_source_search(MapProblem(initial, None, CITIES_GRAPH), goals=[goal])[goal].path_cost
+
+
+def test_identical_requests_are_coalesced():
+    async def scenario():
+        service = RoutingService(CITIES_GRAPH, max_workers=2, batch_window=0.05)
+        try:
+            nodes = await asyncio.gather(*(service.route("Буриндал", "Сидней") for _ in range(20)))
+        finally:
+            service.close()
+        return service, nodes
+
+    service, nodes = run(scenario())
+    counters = service.stats()["counters"]
+    assert counters["requests"] == 20
+    assert counters["coalesced"] == 19
+    assert counters["searches"] < counters["requests"]
+    assert counters["searches"] == 1
+    assert all(node is nodes[0] for node in nodes)
+    assert nodes[0].path_cost == reference_cost("Буриндал", "Сидней")
+
+
+def test_requests_with_common_origin_share_one_search():
+    goals = ["Сидней", "Ньюкасл", "Даббо", "Янг", "Киама"]
+
+    async def scenario():
+        service = RoutingService(CITIES_GRAPH, max_workers=2, batch_window=0.05)
+        try:
+            nodes = await asyncio.gather(*(service.route("Буриндал", goal) for goal in goals))
+        finally:
+            service.close()
+        return service, nodes
+
+    service, nodes = run(scenario())
+    counters = service.stats()["counters"]
+    assert counters["coalesced"] == 0
+    assert counters["searches"] == 1
+    assert counters["goals_searched"] == len(goals)
+    for goal, node in zip(goals, nodes):
+        assert path_states(node)[0] == "Буриндал"
+        assert path_states(node)[-1] == goal
+        assert node.path_cost == reference_cost("Буриндал", goal)
+
+
+def test_unreachable_goal_returns_failure():
+    graph = dict(CITIES_GRAPH, Остров={})
+
+    async def scenario():
+        service = RoutingService(graph)
+        try:
+            return await service.route("Буриндал", "Остров")
+        finally:
+            service.close()
+
+    assert run(scenario()) is failure
+
+
+def test_unknown_city():
+    async def scenario():
+        service = RoutingService(CITIES_GRAPH)
+        try:
+            with pytest.raises(KeyError):
+                await service.route("Атлантида", "Сидней")
+
+            server = await service.serve()
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                client = await RoutingClient.connect(port=port)
+                try:
+                    error = await client.route("Атлантида", "Сидней")
+                    # Соединение после ошибки продолжает работать
+                    ok = await client.route("Сидней", "Сидней")
+                finally:
+                    await client.close()
+        finally:
+            service.close()
+        return error, ok
+
+    error, ok = run(scenario())
+    assert error["error"].startswith("KeyError")
+    assert ok == {"initial": "Сидней", "goal": "Сидней", "route": ["Сидней"], "cost": 0}
+
+
+def test_malformed_requests_keep_connection_open():
+    async def scenario():
+        service = RoutingService(CITIES_GRAPH)
+        try:
+            server = await service.serve()
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                responses = []
+                for line in (b"[1]\n", b"5\n", b"not json\n", '{"initial": "Сидней"}\n'.encode()):
+                    writer.write(line)
+                    await writer.drain()
+                    responses.append(await reader.readline())
+                client = RoutingClient(reader, writer)
+                try:
+                    stats = await client.stats()
+                finally:
+                    await client.close()
+        finally:
+            service.close()
+        return responses, stats
+
+    responses, stats = run(scenario())
+    assert all(b'"error"' in response for response in responses)
+    assert "counters" in stats
+
+
+@pytest.mark.parametrize("kind", ["tcp", "unix"])
+def test_latency_percentiles_under_concurrent_load(kind):
+    if kind == "unix" and not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix-сокеты недоступны")
+
+    cities = list(CITIES_GRAPH)
+    queries = [(cities[i % 5], cities[(i * 7) % len(cities)]) for i in range(400)]
+
+    async def scenario(tmp):
+        service = RoutingService(CITIES_GRAPH, max_workers=4)
+        try:
+            if kind == "unix":
+                path = os.path.join(tmp, "routing.sock")
+                server = await service.serve(path=path)
+
+                def connect():
+                    return RoutingClient.connect(path=path)
+
+            else:
+                server = await service.serve()
+                port = server.sockets[0].getsockname()[1]
+
+                def connect():
+                    return RoutingClient.connect(port=port)
+
+            async with server:
+                latencies = await load_test(connect, list(queries), concurrency=16)
+        finally:
+            service.close()
+        return service, latencies
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service, latencies = run(scenario(tmp))
+
+    assert len(latencies) == len(queries)
+    p50, p99 = routing_service.percentile(latencies, 50), routing_service.percentile(latencies, 99)
+    assert 0 < p50 <= p99 <= max(latencies)
+
+    stats = service.stats()
+    assert stats["counters"]["requests"] == len(queries)
+    assert stats["counters"]["searches"] < len(queries)
+    request_latency = stats["latency"]["request"]
+    assert request_latency["count"] == len(queries)
+    assert 0 < request_latency["p50_ms"] <= request_latency["p99_ms"]
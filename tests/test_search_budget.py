@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import random
+
+import pytest
+
+import example_bfs
+import pitchers
+from labyrinth import LabyrinthProblem, bfs_labyrinth
+from search_budget import BudgetExceeded, CancellationToken, SearchBudget
+
+
+class RoadGridProblem(example_bfs.MapProblem):
+    """Дорожная сеть на плоскости: эвристика — расстояние по прямой до цели."""
+
+    def __init__(self, initial, goal, graph, coordinates):
+        super().__init__(initial, goal, graph)
+        self.coordinates = coordinates
+
+    def h(self, node):
+        (x1, y1), (x2, y2) = self.coordinates[node.state], self.coordinates[self.goal]
+        return math.hypot(x1 - x2, y1 - y2)
+
+
+class CounterProblem(pitchers.Problem):
+    """Состояния — целые числа, действия — прибавить 1 или 2."""
+
+    def actions(self, state):
+        return [1, 2] if state < self.goal else []
+
+    def result(self, state, action):
+        return state + action
+
+
+def road_grid(seed, size=12):
+    rng = random.Random(seed)
+    coordinates = {(i, j): (i + rng.random() * 0.5, j + rng.random() * 0.5) for i in range(size) for j in range(size)}
+    graph = {v: {} for v in coordinates}
+    for (i, j), (x, y) in coordinates.items():
+        for n in ((i + 1, j), (i, j + 1), (i + 1, j + 1)):
+            if n in coordinates and rng.random() < 0.8:
+                w = math.hypot(x - coordinates[n][0], y - coordinates[n][1]) * rng.uniform(1.0, 2.0)
+                graph[(i, j)][n] = graph[n][(i, j)] = w
+    return RoadGridProblem((0, 0), (size - 1, size - 1), graph, coordinates)
+
+
+def cities_problem():
+    return example_bfs.MapProblem("Буриндал", "Сидней", example_bfs.CITIES_GRAPH)
+
+
+def open_labyrinth():
+    return LabyrinthProblem([[1] * 30 for _ in range(30)], (0, 0), (29, 29))
+
+
+def unreachable_jugs():
+    # Из кувшинов чётного объёма нечётный объём не получить
+    return pitchers.WaterJugProblem((0, 0, 0, 0), 1, (4, 6, 8, 10))
+
+
+SEARCHES = {
+    "breadth_first_search": (example_bfs.breadth_first_search, cities_problem),
+    "pitchers.bfs": (pitchers.bfs, unreachable_jugs),
+    "bfs_labyrinth": (bfs_labyrinth, open_labyrinth),
+}
+
+
+def cancelled_token():
+    token = CancellationToken()
+    token.cancel()
+    return token
+
+
+BUDGETS = {
+    "nodes": lambda: SearchBudget(max_nodes=10),
+    "cancelled": lambda: SearchBudget(token=cancelled_token()),
+    "time": lambda: SearchBudget(time_limit=0, check_every=1),
+}
+
+
+@pytest.mark.parametrize("reason", BUDGETS)
+@pytest.mark.parametrize("name", SEARCHES)
+def test_budget_stops_search(name, reason):
+    search, make_problem = SEARCHES[name]
+    budget = BUDGETS[reason]()
+    result = search(make_problem(), budget=budget)
+
+    assert isinstance(result, BudgetExceeded)
+    assert result.reason == budget.reason == reason
+    assert result.expanded == (11 if reason == "nodes" else 1)
+    assert result.best is not None
+    assert result.bound >= 0
+
+
+def test_nodes_budget_keeps_best_so_far():
+    result = bfs_labyrinth(open_labyrinth(), budget=SearchBudget(max_nodes=100))
+    (r, c), bound = result.best, result.bound
+    assert abs(29 - r) + abs(29 - c) < 58
+    assert r + c <= bound
+
+    result = example_bfs.breadth_first_search(cities_problem(), budget=SearchBudget(max_nodes=100))
+    assert example_bfs.path_states(result.best)[0] == "Буриндал"
+    assert result.best.path_cost <= result.bound
+
+
+@pytest.mark.parametrize("max_nodes", [1, 5, 20, 100])
+def test_bound_never_exceeds_optimal_cost(max_nodes):
+    problem = cities_problem()
+    optimal = example_bfs.single_source_search(problem, goals=[problem.goal])[problem.goal]
+    result = example_bfs.breadth_first_search(problem, budget=SearchBudget(max_nodes=max_nodes))
+    assert isinstance(result, BudgetExceeded)
+    assert result.bound <= optimal.path_cost
+
+    problem = open_labyrinth()
+    result = bfs_labyrinth(problem, budget=SearchBudget(max_nodes=max_nodes))
+    assert result.bound <= bfs_labyrinth(problem)
+
+    problem = pitchers.WaterJugProblem((0, 0, 0), 7, (5, 6, 10))
+    result = pitchers.bfs(problem, budget=SearchBudget(max_nodes=max_nodes))
+    if isinstance(result, BudgetExceeded):
+        assert result.bound <= len(pitchers.path_actions(pitchers.bfs(problem)))
+
+    problem = road_grid(0)
+    optimal = example_bfs.single_source_search(problem, goals=[problem.goal])[problem.goal]
+    result = example_bfs.anytime_route(problem, weight=3.0, budget=SearchBudget(max_nodes=max_nodes))
+    if isinstance(result, BudgetExceeded):
+        assert result.bound <= optimal.path_cost + 1e-9
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("weight", [1.0, 2.0, 5.0])
+def test_anytime_without_budget_is_optimal(seed, weight):
+    problem = road_grid(seed)
+    optimal = example_bfs.single_source_search(problem, goals=[problem.goal]).get(problem.goal)
+    costs = [node.path_cost for node in example_bfs.anytime_weighted_astar(problem, weight=weight)]
+    if optimal is None:
+        # Случайная сеть могла отрезать угол с целью
+        assert costs == []
+        assert example_bfs.anytime_route(problem, weight=weight) is example_bfs.failure
+        return
+
+    assert costs == sorted(costs, reverse=True)
+    assert costs[-1] == pytest.approx(optimal.path_cost)
+    assert example_bfs.anytime_route(problem, weight=weight).path_cost == pytest.approx(optimal.path_cost)
+
+
+def test_anytime_budget_after_first_solution():
+    problem = road_grid(1, size=30)
+    optimal = example_bfs.single_source_search(problem, goals=[problem.goal])[problem.goal]
+    first = next(example_bfs.anytime_weighted_astar(problem, weight=5.0))
+
+    search = example_bfs.anytime_weighted_astar(problem, weight=5.0, budget=SearchBudget(max_nodes=200))
+    solutions = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            solutions.append(next(search))
+    exceeded = stop.value.value
+
+    assert solutions and solutions[0].path_cost == first.path_cost
+    assert isinstance(exceeded, BudgetExceeded)
+    assert exceeded.best is solutions[-1]
+    assert exceeded.bound <= optimal.path_cost + 1e-9
+
+
+def test_anytime_route_before_first_solution():
+    problem = road_grid(2)
+    result = example_bfs.anytime_route(problem, budget=SearchBudget(max_nodes=1))
+
+    assert isinstance(result, BudgetExceeded)
+    assert result.reason == "nodes"
+    assert result.best.state == problem.initial
+    assert result.bound <= example_bfs.anytime_route(problem).path_cost
+
+
+def test_anytime_route_unreachable():
+    graph = {"A": {"B": 1}, "B": {"A": 1}, "C": {}}
+    problem = example_bfs.MapProblem("A", "C", graph)
+    assert example_bfs.anytime_route(problem) is example_bfs.failure
+
+
+@pytest.mark.parametrize("max_nodes", [None, 1000])
+def test_bfs_on_generic_problem(max_nodes):
+    budget = None if max_nodes is None else SearchBudget(max_nodes=max_nodes)
+    node = pitchers.bfs(CounterProblem(0, 5), budget=budget)
+    assert node.state == 5
+    assert len(pitchers.path_actions(node)) == 3
+
+
+def test_bfs_without_jugs_fails():
+    assert pitchers.bfs(pitchers.WaterJugProblem((), 1, ())) is pitchers.failure
+    result = pitchers.bfs(pitchers.WaterJugProblem((), 1, ()), budget=SearchBudget(max_nodes=10))
+    assert result is pitchers.failure
+
+
+def test_bfs_labyrinth_without_goal():
+    problem = LabyrinthProblem([[1, 1], [1, 0]], (0, 0), None)
+    assert bfs_labyrinth(problem) is None
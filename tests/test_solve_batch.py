@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+
+import pytest
+
+import solve_batch
+from result_cache import ResultCache
+
+
+# Граф с циклом A <-> B и городом C, в который нельзя попасть
+CYCLIC_GRAPH = {"A": {"B": 1}, "B": {"A": 1, "D": 5}, "C": {}, "D": {"B": 5}}
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "cached"])
+def cache_path(request):
+    if not request.param:
+        solve_batch._init_worker(None)
+        yield None
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.sqlite")
+            solve_batch._init_worker(path)
+            yield path
+            solve_batch._init_worker(None)
+
+
+def solve(task):
+    return json.loads(solve_batch.solve_line((1, json.dumps(task, ensure_ascii=False))))
+
+
+def test_route_found(cache_path):
+    for _ in range(2):
+        result = solve({"type": "route", "initial": "A", "goal": "D", "graph": CYCLIC_GRAPH})
+        assert result["route"] == ["A", "B", "D"]
+        assert result["cost"] == 6
+
+
+def test_unreachable_route_in_cyclic_graph(cache_path):
+    for _ in range(2):
+        result = solve({"type": "route", "initial": "A", "goal": "C", "graph": CYCLIC_GRAPH})
+        assert result == {"line": 1, "type": "route", "route": None, "cost": None}
+
+
+def test_goal_missing_from_graph(cache_path):
+    result = solve({"type": "route", "initial": "Буриндал", "goal": "Атлантида"})
+    assert result["route"] is None
+    assert result["cost"] is None
+
+
+def test_initial_missing_from_graph(cache_path):
+    result = solve({"type": "route", "initial": "Атлантида", "goal": "Сидней"})
+    assert result["error"].startswith("KeyError")
+
+
+def test_default_graph_route(cache_path):
+    result = solve({"id": 7, "type": "route", "initial": "Буриндал", "goal": "Сидней"})
+    assert result["id"] == 7
+    assert result["route"][0] == "Буриндал"
+    assert result["route"][-1] == "Сидней"
+    assert result["cost"] == 779
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cli_cache_stats(tmp_path, workers):
+    tasks = tmp_path / "tasks.jsonl"
+    task = json.dumps({"type": "islands", "grid": [[1, 0, 1], [0, 0, 1]]})
+    tasks.write_text((task + "\n") * 3, encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+    db = str(tmp_path / "results.sqlite")
+
+    for _ in range(2):
+        argv = [str(tasks), "-o", str(output), "--cache", db, "--workers", str(workers)]
+        assert solve_batch.main(argv) == 0
+        results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert [r["count"] for r in results] == [2, 2, 2]
+
+    with ResultCache(db) as cache:
+        counts = cache.stats()["count_islands_bfs"]
+    assert counts["hits"] + counts["misses"] == 6
+    if workers == 1:
+        assert counts == {"hits": 5, "misses": 1, "hit_rate": 5 / 6}
+    else:
+        # Первую задачу параллельные исполнители могут не найти в кэше одновременно
+        assert counts["misses"] <= workers